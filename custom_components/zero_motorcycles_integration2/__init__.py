@@ -9,9 +9,19 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
+from .budget import async_remove_stored_budget
+from .capabilities import async_remove_stored_capabilities
 from .const import DOMAIN
-from .coordinator import ZeroCoordinator
+from .coordinator import ZeroCoordinator, async_remove_stored_units
+from .energy import async_remove_stored_energy
+from .geocode import async_remove_stored_addresses
+from .high_churn import async_apply_statistics_only, async_remove_stored_statistics
+from .push import async_setup_push_webhook
+from .services import async_setup_services
+from .tracks import ZeroTrackView
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -20,6 +30,17 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services and the track view shared by all entries."""
+
+    async_setup_services(hass)
+    hass.http.register_view(ZeroTrackView())
+
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -30,15 +51,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         configEntry=entry,
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.budget.async_load()
+    await coordinator.addresses.async_load()
+    await coordinator.capabilities.async_load()
+    await coordinator.energy.async_load()
+    if coordinator.statistics:
+        await coordinator.statistics.async_load()
+
+    # phase one: only the unit list is needed to create devices and entities, they restore their last state
+    await coordinator.async_setup_units()
 
     # Initialize the HASS structure
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # high churn sensors are disabled before they are set up when only their statistics are kept
+    async_apply_statistics_only(hass, entry, coordinator.statistics_only)
+    coordinator.async_update_unsupported_entities()
+    if coordinator.statistics:
+        entry.async_on_unload(coordinator.statistics.async_flush)
+    entry.async_on_unload(coordinator.energy.async_track_hours())
+    entry.async_on_unload(coordinator.energy.async_flush)
+    entry.async_on_unload(coordinator.budget.async_save)
+
     # configure all sensors
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # phase two: fetch the data of the units without holding up startup
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_refresh(),
+        f"{DOMAIN} first refresh",
+    )
+
+    if coordinator.push_webhook:
+        async_setup_push_webhook(hass, entry, coordinator)
+
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -51,6 +99,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data stored for an entry."""
+    await async_remove_stored_units(hass, entry)
+    await async_remove_stored_budget(hass, entry)
+    await async_remove_stored_addresses(hass, entry)
+    await async_remove_stored_capabilities(hass, entry)
+    await async_remove_stored_energy(hass, entry)
+    await async_remove_stored_statistics(hass, entry)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle an options update."""
     await hass.config_entries.async_reload(entry.entry_id)
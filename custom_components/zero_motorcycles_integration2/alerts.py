@@ -0,0 +1,27 @@
+"""Safety alerts raised by tracking units."""
+from __future__ import annotations
+
+from .api import TrackingUnitStateKeys
+
+# checked on every fetch before anything else is done with the data
+ALERT_KEYS: tuple[TrackingUnitStateKeys, ...] = (
+    "tipover",
+    "emergency",
+    "shock",
+)
+
+
+class AlertTracker:
+    """Remembers which alerts are active on a unit so each is only announced once."""
+
+    __slots__ = ("active",)
+
+    def __init__(self) -> None:
+        """Start without active alerts."""
+        self.active: frozenset[str] = frozenset()
+
+    def update(self, active: frozenset[str]) -> frozenset[str]:
+        """Store the currently active alerts and return the ones that were just raised."""
+        raised = active - self.active
+        self.active = active
+        return raised
@@ -7,12 +7,15 @@ https://bitbucket.org/cappelleh/zengo-android/src/master/
 from __future__ import annotations
 
 import asyncio
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime
 import socket
-from typing import Any, Literal, Required, TypedDict
+from typing import Any, Final, Literal, Required, TypedDict
 
 import aiohttp
 
+from .profiler import RefreshProfiler
+
 PROP_VIN = "name" # the tracking unit property we expect to contain the VIN
 
 
@@ -133,6 +136,10 @@ TrackingUnitStateKeys = Literal[
     "battery",
 ]
 
+# seconds a request may take when no shorter timeout is given
+REQUEST_TIMEOUT: Final = 10.0
+
+
 class ZeroApiClientError(Exception):
     """Exception to indicate a general API error."""
 
@@ -158,6 +165,10 @@ class ZeroApiClient:
         self._username = username
         self._password = password
         self._session = session
+        self.profiler: RefreshProfiler | None = None
+
+    def _span(self, name: str) -> AbstractContextManager:
+        return self.profiler.span(name) if self.profiler else nullcontext()
 
     async def async_get_units(self) -> list[TrackingUnit]:
         """Get available unit numbers for given credentials from API."""
@@ -172,7 +183,7 @@ class ZeroApiClient:
             }
         )
 
-    async def async_get_last_transmit(self, unitnumber) -> TrackingUnitState:
+    async def async_get_last_transmit(self, unitnumber, timeout: float = REQUEST_TIMEOUT) -> TrackingUnitState:
         """Get available available data from API."""
         result = await self._api_wrapper(
             method="get",
@@ -183,7 +194,8 @@ class ZeroApiClient:
                 "user": self._username,
                 "pass": self._password,
                 "unitnumber": unitnumber
-            }
+            },
+            timeout=timeout,
         )
         if not len(result) == 1:
             raise ZeroApiClientCommunicationError("Unexpected response value: {result}")
@@ -196,18 +208,22 @@ class ZeroApiClient:
         url: str,
         params: dict | None = None,
         json: dict | None = None,
+        timeout: float = REQUEST_TIMEOUT,
     ) -> Any:
         """Get information from the API."""
         try:
-            async with asyncio.timeout(10):
-                response = await self._session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json,
-                )
-            response.raise_for_status()
-            return await response.json()
+            with self._span("network"):
+                async with asyncio.timeout(timeout):
+                    response = await self._session.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        json=json,
+                    )
+                    response.raise_for_status()
+                    await response.read()
+            with self._span("json_decode"):
+                return await response.json()
 
         except TimeoutError as exception:
             raise ZeroApiClientCommunicationError(
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 from typing import cast, Any
 
 from homeassistant.components.binary_sensor import (
@@ -11,13 +12,16 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .api import TrackingUnit, TrackingUnitState, TrackingUnitStateKeys
-from .const import DOMAIN, LOGGER
-from .coordinator import ZeroCoordinator, parse_state_as_bool, parse_state_as_date
-from .entity import ZeroEntity
+from .const import DOMAIN
+from .coordinator import ZeroCoordinator, parse_state_as_bool, unit_unique_id
+from .entity import ZeroEntity, async_add_unit_entities
+from .freshness import field_group
 
 
 @dataclass(frozen=True)
@@ -108,23 +112,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
     coordinator: ZeroCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        [
-            ZeroBinarySensor(
-                coordinator,
-                entity_description,
-                unit=unitInfo
+    async_add_unit_entities(
+        coordinator,
+        async_add_entities,
+        lambda unitInfo: (
+            (
+                unit_unique_id(unitInfo, entity_description.key),
+                partial(ZeroBinarySensor, coordinator, entity_description, unit=unitInfo),
             )
-            for unitInfo in coordinator.units
             for entity_description in SENSORS
-        ],
-        True
+            if entity_description.data_fn or coordinator.supports(unitInfo, entity_description.key)
+        ),
     )
 
 
-class ZeroBinarySensor(ZeroEntity, BinarySensorEntity):
+class ZeroBinarySensor(ZeroEntity, BinarySensorEntity, RestoreEntity):
     """integration_blueprint binary_sensor class."""
 
+    entity_description: ZeroBinarySensorEntityDescription
+
+    # changes with every update and is already part of the state history
+    _unrecorded_attributes = frozenset({"timestamp"})
+
     def __init__(
         self,
         coordinator: ZeroCoordinator,
@@ -136,7 +145,15 @@ class ZeroBinarySensor(ZeroEntity, BinarySensorEntity):
 
         self.entity_description = entity_description
 
-        self._attr_unique_id = f"{self.vin}-{entity_description.key}"
+        self._attr_unique_id = unit_unique_id(unit, entity_description.key)
+        self.field_group = field_group(entity_description.key)
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state while the first update runs in the background."""
+        await super().async_added_to_hass()
+
+        if (last_state := await self.async_get_last_state()) is not None and last_state.state in (STATE_ON, STATE_OFF):
+            self._attr_is_on = last_state.state == STATE_ON
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -149,32 +166,25 @@ class ZeroBinarySensor(ZeroEntity, BinarySensorEntity):
             state = self.entity_description.data_fn(self.coordinator, unit_state)
         else:
             state = self.coordinator.data.get(self.unitnumber, {}).get(self.entity_description.data_key) if self.coordinator.data else None
-            LOGGER.debug(
-                "Sensor value for %s is %s",
-                self.unique_id,
-                state,
-            )
 
         state = parse_state_as_bool(state)
 
         if (state is not None):
             state = self.entity_description.value_fn(state)
-        else:
-            LOGGER.warning(
-                "Invalid sensor value for %s: %s",
-                self.unique_id,
-                state,
-            )
+        elif self.coordinator.data and self.unitnumber in self.coordinator.data:
+            # fields some models never report are only logged once
+            self.coordinator.log.missing_field(self.unitnumber, self.entity_description.key)
 
         self._attr_is_on = state
 
-        datetime_data = self.coordinator.data.get(self.unitnumber, {}).get("datetime_actual") if self.coordinator.data else None
+        self._attr_extra_state_attributes = self.coordinator.timestamp_attributes(self.unitnumber)
 
-        self._attr_extra_state_attributes = {
-            "timestamp": parse_state_as_date(datetime_data)
-        }
+        super()._handle_coordinator_update()
 
-        if self.entity_description.off_icon:
-            self._attr_icon = self.entity_description.icon if self._attr_is_on else self.entity_description.off_icon
+    @property
+    def icon(self) -> str | None:
+        """Pick the on or off icon when the state is read."""
 
-        super()._handle_coordinator_update()
+        if self.entity_description.off_icon:
+            return self.entity_description.icon if self.is_on else self.entity_description.off_icon
+        return super().icon
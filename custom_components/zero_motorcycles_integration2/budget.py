@@ -0,0 +1,142 @@
+"""Budget of api requests per hour and per day."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from time import time
+from typing import Any, Final
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+# fetch priorities, lower goes first
+PRIORITY_ALERT_OR_RIDING: Final = 0
+PRIORITY_CHARGING: Final = 1
+PRIORITY_PARKED: Final = 2
+
+# share of the budget that has to be left before units of a priority are fetched,
+# so riding bikes keep getting updates when parked ones no longer do
+PRIORITY_RESERVE: Final = {
+    PRIORITY_ALERT_OR_RIDING: 0.0,
+    PRIORITY_CHARGING: 0.25,
+    PRIORITY_PARKED: 0.5,
+}
+
+HOUR: Final = 3600
+DAY: Final = 24 * HOUR
+BUCKET: Final = 60
+
+BUDGET_STORAGE_VERSION: Final = 1
+BUDGET_SAVE_DELAY: Final = 60
+
+
+def _budget_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[list[list[int]]]:
+    return Store(hass, BUDGET_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.budget")
+
+
+async def async_remove_stored_budget(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the requests counted for an entry."""
+
+    await _budget_store(hass, entry).async_remove()
+
+
+class RequestBudget:
+    """Counts requests in per minute buckets over the last day, a limit of 0 means unlimited.
+
+    The buckets are stored, so restarts and reloads keep counting the requests of the last day.
+    """
+
+    __slots__ = ("hourly_limit", "daily_limit", "deferred", "_buckets", "_store", "_clock")
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        hourly_limit: int = 0,
+        daily_limit: int = 0,
+        clock: Callable[[], float] = time,
+    ) -> None:
+        """Start without any requests made, the stored ones are loaded by async_load.
+
+        The clock returns the current timestamp, replays pass one that runs faster.
+        """
+        self.hourly_limit = hourly_limit
+        self.daily_limit = daily_limit
+        # number of fetches put off during the last update
+        self.deferred = 0
+        self._buckets: deque[list[int]] = deque()
+        self._store = _budget_store(hass, entry)
+        self._clock = clock
+
+    async def async_load(self) -> None:
+        """Load the requests counted by the last runs."""
+        if stored := await self._store.async_load():
+            now = self._clock()
+            # a replay runs ahead of the wall clock, its buckets would count for too long
+            self._buckets = deque([start, count] for start, count in stored if start <= now)
+            self._prune(now)
+
+    async def async_save(self) -> None:
+        """Save the buckets right away, the next run may start before a delayed save."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> list[list[int]]:
+        return [list(bucket) for bucket in self._buckets]
+
+    def _prune(self, now: float) -> None:
+        while self._buckets and self._buckets[0][0] <= now - DAY:
+            self._buckets.popleft()
+
+    def _used(self, now: float, period: int) -> int:
+        self._prune(now)
+        return sum(count for start, count in self._buckets if start > now - period)
+
+    def used_hour(self) -> int:
+        """Return the number of requests made during the last hour."""
+        return self._used(self._clock(), HOUR)
+
+    def used_day(self) -> int:
+        """Return the number of requests made during the last day."""
+        return self._used(self._clock(), DAY)
+
+    def remaining_share(self) -> float:
+        """Return the smallest share of the hourly and daily budget that is left."""
+        now = self._clock()
+        share = 1.0
+        if self.hourly_limit:
+            share = min(share, 1 - self._used(now, HOUR) / self.hourly_limit)
+        if self.daily_limit:
+            share = min(share, 1 - self._used(now, DAY) / self.daily_limit)
+        return max(share, 0.0)
+
+    def allows(self, priority: int) -> bool:
+        """Check if a request of the given priority fits the budget."""
+        if not self.hourly_limit and not self.daily_limit:
+            return True
+        remaining = self.remaining_share()
+        return remaining > 0 and remaining > PRIORITY_RESERVE.get(priority, 0.0)
+
+    def spend(self) -> None:
+        """Count a request."""
+        now = self._clock()
+        start = int(now // BUCKET * BUCKET)
+        if self._buckets and self._buckets[-1][0] == start:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([start, 1])
+            self._prune(now)
+        self._store.async_delay_save(self._data_to_save, BUDGET_SAVE_DELAY)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the budget, used for sensor attributes."""
+        return {
+            "requests_last_hour": self.used_hour(),
+            "requests_last_day": self.used_day(),
+            "hourly_limit": self.hourly_limit or None,
+            "daily_limit": self.daily_limit or None,
+            "remaining_share": round(self.remaining_share(), 3),
+            "deferred": self.deferred,
+        }
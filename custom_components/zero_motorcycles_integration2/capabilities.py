@@ -0,0 +1,92 @@
+"""Fields every unit actually reports, learned from its first payloads."""
+from __future__ import annotations
+
+from typing import Any, Final, get_args
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import TrackingUnitState, TrackingUnitStateKeys
+from .const import DOMAIN, LOGGER
+
+# payloads looked at before the fields of a unit are known
+LEARN_PAYLOADS: Final = 5
+
+CAPABILITIES_STORAGE_VERSION: Final = 1
+CAPABILITIES_SAVE_DELAY: Final = 30
+
+STATE_KEYS: Final = frozenset(get_args(TrackingUnitStateKeys))
+
+
+def _capabilities_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, dict[str, Any]]]:
+    return Store(hass, CAPABILITIES_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.capabilities")
+
+
+async def async_remove_stored_capabilities(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the capabilities stored for an entry."""
+
+    await _capabilities_store(hass, entry).async_remove()
+
+
+class CapabilityMap:
+    """Per unit the fields that had a value in any of its first payloads.
+
+    Until a unit has sent LEARN_PAYLOADS payloads every field counts as supported,
+    a field showing up later on is added to the unit.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Start without any units, the stored ones are loaded by async_load."""
+        self._store = _capabilities_store(hass, entry)
+        self._payloads: dict[str, int] = {}
+        self._keys: dict[str, set[str]] = {}
+
+    async def async_load(self) -> None:
+        """Load the capabilities learned by the last runs."""
+        if stored := await self._store.async_load():
+            for unitnumber, capabilities in stored.items():
+                self._payloads[unitnumber] = capabilities["payloads"]
+                self._keys[unitnumber] = set(capabilities["keys"])
+
+    def is_learned(self, unitnumber: str) -> bool:
+        """Check if enough payloads of the unit were seen to know its fields."""
+        return self._payloads.get(unitnumber, 0) >= LEARN_PAYLOADS
+
+    def supports(self, unitnumber: str, key: str) -> bool:
+        """Check if a unit reports a field, any field is supported while the unit is still learning."""
+        return not self.is_learned(unitnumber) or key in self._keys[unitnumber]
+
+    @callback
+    def learn(self, unitnumber: str, unit_state: TrackingUnitState) -> bool:
+        """Add the fields with a value, return True when the supported fields of a learned unit changed."""
+        learned = self.is_learned(unitnumber)
+        keys = self._keys.setdefault(unitnumber, set())
+        reported = {key for key, value in unit_state.items() if value is not None and value != ""}
+        new_keys = reported - keys
+        if learned and not new_keys:
+            return False
+
+        keys |= new_keys
+        if not learned:
+            self._payloads[unitnumber] = self._payloads.get(unitnumber, 0) + 1
+        self._store.async_delay_save(self._data_to_save, CAPABILITIES_SAVE_DELAY)
+
+        if self.is_learned(unitnumber):
+            if not learned:
+                LOGGER.debug("%s reports %d of %d fields", unitnumber, len(keys & STATE_KEYS), len(STATE_KEYS))
+            return True
+        return False
+
+    @callback
+    def forget(self, unitnumber: str) -> None:
+        """Drop a removed unit."""
+        if self._payloads.pop(unitnumber, None) is not None:
+            self._keys.pop(unitnumber, None)
+            self._store.async_delay_save(self._data_to_save, CAPABILITIES_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        return {
+            unitnumber: {"payloads": payloads, "keys": sorted(self._keys.get(unitnumber, ()))}
+            for unitnumber, payloads in self._payloads.items()
+        }
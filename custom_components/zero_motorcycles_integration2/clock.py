@@ -0,0 +1,67 @@
+"""Clocks the coordinator takes its times from, replays run on a faster one."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from time import monotonic, time
+
+from homeassistant.util import dt as dt_util
+
+
+class Clock:
+    """Wall clock time."""
+
+    speed = 1.0
+
+    def now(self) -> datetime:
+        """Return the local time, used for scheduling."""
+        return datetime.now()
+
+    def utcnow(self) -> datetime:
+        """Return the time to compare the timestamps of the api with."""
+        return dt_util.utcnow()
+
+    def time(self) -> float:
+        """Return the time as a timestamp, used for the request budget."""
+        return time()
+
+
+class ReplayClock(Clock):
+    """Replayed time, starts at the current time and moves `speed` times as fast.
+
+    Once the recording is loaded utcnow follows the recorded time, so the timestamps
+    in replayed responses age like they did while recording.
+    """
+
+    def __init__(self, speed: float) -> None:
+        """Start the clock."""
+        self.speed = speed
+        self._started = monotonic()
+        self._local_start = datetime.now()
+        self._time_start = time()
+        # recorded time at the start of the clock, known once the recording is loaded
+        self._recorded_offset: float | None = None
+
+    def elapsed(self) -> float:
+        """Return the replayed seconds since the clock started."""
+        return (monotonic() - self._started) * self.speed
+
+    def now(self) -> datetime:
+        """Return the replayed local time."""
+        return self._local_start + timedelta(seconds=self.elapsed())
+
+    def utcnow(self) -> datetime:
+        """Return the recorded time, the replayed time until the recording is loaded."""
+        start = self._time_start if self._recorded_offset is None else self._recorded_offset
+        return dt_util.utc_from_timestamp(start + self.elapsed())
+
+    def time(self) -> float:
+        """Return the replayed time as a timestamp."""
+        return self._time_start + self.elapsed()
+
+    def start_recording(self, recorded_start: float) -> None:
+        """Move the recorded time to the start of the recording, from now on it moves with the clock."""
+        self._recorded_offset = recorded_start - self.elapsed()
+
+    def recorded_time(self) -> float:
+        """Return the recorded time as a timestamp."""
+        return (self._recorded_offset or 0.0) + self.elapsed()
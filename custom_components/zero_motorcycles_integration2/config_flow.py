@@ -9,25 +9,52 @@ from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResu
 from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
 from homeassistant.core import callback
 from homeassistant.helpers.selector import (
+    BooleanSelector,
     TextSelector,
     TextSelectorConfig,
     TextSelectorType,
     DurationSelector,
-    DurationSelectorConfig
+    DurationSelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
 )
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.schema_config_entry_flow import (
+    SchemaCommonFlowHandler,
     SchemaFlowFormStep,
     SchemaOptionsFlowHandler,
 )
 
 from .api import (
+    PROP_VIN,
     ZeroApiClient,
     ZeroApiClientAuthenticationError,
     ZeroApiClientCommunicationError,
     ZeroApiClientError,
 )
-from .const import DOMAIN, LOGGER, CONF_RAPID_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_DAILY_REQUEST_LIMIT,
+    CONF_DEEP_IDLE_SCAN_INTERVAL,
+    CONF_HOURLY_REQUEST_LIMIT,
+    CONF_RAPID_SCAN_INTERVAL,
+    CONF_RECORD_FILE,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    CONF_STATISTICS_ONLY,
+    CONF_PUSH_WEBHOOK,
+    CONF_GPS_STALE_AFTER,
+    CONF_TELEMETRY_STALE_AFTER,
+    CONF_FLEET_SHARDS,
+)
+from .coordinator import store_units_discovery
+from .profiles import CONF_PROFILE_UNITS
 
 OPTIONS_SCHEMA = {
     vol.Optional(
@@ -36,6 +63,72 @@ OPTIONS_SCHEMA = {
     vol.Optional(
         CONF_RAPID_SCAN_INTERVAL
     ): DurationSelector(DurationSelectorConfig(allow_negative=False)),
+    vol.Optional(
+        CONF_DEEP_IDLE_SCAN_INTERVAL
+    ): DurationSelector(DurationSelectorConfig(allow_negative=False)),
+    vol.Optional(
+        CONF_RECORD_FILE
+    ): TextSelector(
+        TextSelectorConfig(
+            type=TextSelectorType.TEXT
+        ),
+    ),
+    vol.Optional(
+        CONF_REPLAY_FILE
+    ): TextSelector(
+        TextSelectorConfig(
+            type=TextSelectorType.TEXT
+        ),
+    ),
+    vol.Optional(
+        CONF_REPLAY_SPEED
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=0.001,
+            step="any",
+            mode=NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(
+        CONF_HOURLY_REQUEST_LIMIT
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=0,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(
+        CONF_DAILY_REQUEST_LIMIT
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=0,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(
+        CONF_STATISTICS_ONLY
+    ): BooleanSelector(),
+    vol.Optional(
+        CONF_PUSH_WEBHOOK
+    ): BooleanSelector(),
+    vol.Optional(
+        CONF_GPS_STALE_AFTER
+    ): DurationSelector(DurationSelectorConfig(allow_negative=False)),
+    vol.Optional(
+        CONF_TELEMETRY_STALE_AFTER
+    ): DurationSelector(DurationSelectorConfig(allow_negative=False)),
+    vol.Optional(
+        CONF_FLEET_SHARDS
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=1,
+            max=64,
+            step=1,
+            mode=NumberSelectorMode.BOX,
+        ),
+    ),
 }
 
 USER_SCHEMA = {
@@ -60,8 +153,40 @@ CONFIG_SCHEMA = {
     **OPTIONS_SCHEMA
 }
 
+
+async def options_schema(handler: SchemaCommonFlowHandler) -> vol.Schema:
+    """Add a selection of units for each scan profile to the options."""
+    coordinator = handler.parent_handler.hass.data.get(DOMAIN, {}).get(handler.parent_handler.config_entry.entry_id)
+    unit_options: dict[str, SelectOptionDict] = {
+        unit["unitnumber"]: SelectOptionDict(value=unit["unitnumber"], label=f"{unit[PROP_VIN]} ({unit['unitnumber']})")
+        for unit in (coordinator.units if coordinator else [])
+    }
+    # keep units that are assigned but currently unknown selectable
+    for option in CONF_PROFILE_UNITS.values():
+        for unitnumber in handler.options.get(option, []):
+            unit_options.setdefault(unitnumber, SelectOptionDict(value=unitnumber, label=unitnumber))
+
+    return vol.Schema(
+        {
+            **OPTIONS_SCHEMA,
+            **{
+                vol.Optional(
+                    option
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=list(unit_options.values()),
+                        multiple=True,
+                        mode=SelectSelectorMode.DROPDOWN,
+                    ),
+                )
+                for option in CONF_PROFILE_UNITS.values()
+            },
+        }
+    )
+
+
 OPTIONS_FLOW = {
-    "init": SchemaFlowFormStep(vol.Schema(OPTIONS_SCHEMA)),
+    "init": SchemaFlowFormStep(options_schema),
 }
 
 
@@ -94,6 +219,8 @@ class ZeroIntegrationConfigFlow(ConfigFlow, domain=DOMAIN):
                 LOGGER.exception(exception)
                 _errors["base"] = "unknown"
             else:
+                # hand the units and validated client to the coordinator so it doesn't have to fetch them again
+                store_units_discovery(self.hass, user_input[CONF_USERNAME], client, units)
                 return self.async_create_entry(
                     title="Zero Motorcycles",
                     data=user_input,
@@ -110,7 +237,7 @@ class ZeroIntegrationConfigFlow(ConfigFlow, domain=DOMAIN):
         client = ZeroApiClient(
             username=username,
             password=password,
-            session=async_create_clientsession(self.hass),
+            session=async_get_clientsession(self.hass),
         )
         return await client.async_get_units(), client  # this only requires username and password and retrieves unit numbers
 
@@ -10,6 +10,26 @@ BRAND: Final = "Zero Motorcycles"
 BRAND_ATTRIBUTION: Final = "Zero Motorcycles, Inc."
 
 CONF_RAPID_SCAN_INTERVAL: Final = "rapid_scan_interval"
+CONF_DEEP_IDLE_SCAN_INTERVAL: Final = "deep_idle_scan_interval"
+CONF_RECORD_FILE: Final = "record_file"
+CONF_REPLAY_FILE: Final = "replay_file"
+CONF_REPLAY_SPEED: Final = "replay_speed"
+CONF_HOURLY_REQUEST_LIMIT: Final = "hourly_request_limit"
+CONF_DAILY_REQUEST_LIMIT: Final = "daily_request_limit"
+CONF_STATISTICS_ONLY: Final = "statistics_only"
+CONF_PUSH_WEBHOOK: Final = "push_webhook"
+CONF_GPS_STALE_AFTER: Final = "gps_stale_after"
+CONF_TELEMETRY_STALE_AFTER: Final = "telemetry_stale_after"
+CONF_FLEET_SHARDS: Final = "fleet_shards"
 
 DEFAULT_SCAN_INTERVAL: Final = timedelta(minutes=30)
 DEFAULT_RAPID_SCAN_INTERVAL: Final = timedelta(seconds=30)
+DEFAULT_DEEP_IDLE_SCAN_INTERVAL: Final = timedelta(hours=6)
+
+EVENT_ALERT: Final = f"{DOMAIN}_alert"
+
+# how long a unit is polled at the rapid scan interval after raising a safety alert
+ALERT_RAPID_SCAN_DURATION: Final = timedelta(minutes=15)
+
+# how long a unit has to be parked before it is polled at the deep idle interval
+DEEP_IDLE_AFTER: Final = timedelta(hours=2)
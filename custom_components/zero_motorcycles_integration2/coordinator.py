@@ -1,37 +1,147 @@
 """DataUpdateCoordinator for zero_motorcycles_integration."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable, Mapping
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from operator import itemgetter
+import sys
+from time import monotonic
+from types import MappingProxyType
 from typing import Any
+from zlib import crc32
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util import dt as dt_util
 
+from .alerts import ALERT_KEYS, AlertTracker
 from .api import (
+    PROP_VIN,
     TrackingUnit,
     TrackingUnitState,
+    TrackingUnitStateKeys,
     ZeroApiClient,
     ZeroApiClientAuthenticationError,
+    ZeroApiClientCommunicationError,
     ZeroApiClientError,
 )
-from .const import LOGGER, CONF_RAPID_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DEFAULT_RAPID_SCAN_INTERVAL
+from .const import (
+    LOGGER,
+    BRAND,
+    ALERT_RAPID_SCAN_DURATION,
+    CONF_DAILY_REQUEST_LIMIT,
+    CONF_DEEP_IDLE_SCAN_INTERVAL,
+    CONF_HOURLY_REQUEST_LIMIT,
+    CONF_RAPID_SCAN_INTERVAL,
+    CONF_RECORD_FILE,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    CONF_STATISTICS_ONLY,
+    CONF_PUSH_WEBHOOK,
+    CONF_GPS_STALE_AFTER,
+    CONF_TELEMETRY_STALE_AFTER,
+    CONF_FLEET_SHARDS,
+    DEEP_IDLE_AFTER,
+    DEFAULT_DEEP_IDLE_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_RAPID_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_ALERT,
+)
+from .budget import PRIORITY_ALERT_OR_RIDING, PRIORITY_CHARGING, PRIORITY_PARKED, RequestBudget
+from .capabilities import STATE_KEYS, CapabilityMap
+from .clock import Clock, ReplayClock
+from .deltas import UnitDeltaLog
+from .drain import DrainMonitor
+from .energy import EnergyEstimator
+from .fleet import FleetSummary, summarize_fleet
+from .freshness import GROUP_GPS, GROUP_TELEMETRY, is_newer, stale_groups
+from .geocode import AddressCache
+from .high_churn import HIGH_CHURN_KEYS, HighChurnStatistics
+from .latency import CYCLE_BUDGET_SHARE, LatencyTracker
+from .logs import UnitLog
+from .motion import MotionTracker
+from .profiler import RefreshProfiler
+from .profiles import CONF_PROFILE_UNITS, PROFILE_DEFAULT, SCAN_PROFILES, ScanProfile, unit_profiles
+from .replay import ZeroRecordingApiClient, ZeroReplayApiClient
+from .tracks import UnitTrack
 
 
 OPTIONS_VALIDATOR_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): cv.positive_time_period,
         vol.Optional(CONF_RAPID_SCAN_INTERVAL, default=DEFAULT_RAPID_SCAN_INTERVAL): cv.positive_time_period,
+        vol.Optional(CONF_DEEP_IDLE_SCAN_INTERVAL, default=DEFAULT_DEEP_IDLE_SCAN_INTERVAL): cv.positive_time_period,
+        vol.Optional(CONF_RECORD_FILE): cv.string,
+        vol.Optional(CONF_REPLAY_FILE): cv.string,
+        vol.Optional(CONF_REPLAY_SPEED, default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0.001)),
+        vol.Optional(CONF_HOURLY_REQUEST_LIMIT, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_DAILY_REQUEST_LIMIT, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(CONF_STATISTICS_ONLY, default=False): cv.boolean,
+        vol.Optional(CONF_PUSH_WEBHOOK, default=False): cv.boolean,
+        vol.Optional(CONF_GPS_STALE_AFTER, default=timedelta(0)): cv.positive_time_period,
+        vol.Optional(CONF_TELEMETRY_STALE_AFTER, default=timedelta(0)): cv.positive_time_period,
+        vol.Optional(CONF_FLEET_SHARDS, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+        **{
+            vol.Optional(option, default=[]): vol.All(cv.ensure_list, [cv.string])
+            for option in CONF_PROFILE_UNITS.values()
+        },
     }
 )
 
+# units found by the config flow are only reused by the coordinator if the entry is set up soon after
+DISCOVERY_MAX_AGE = timedelta(minutes=5)
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+
+# fetches running at the same time during a refresh
+MAX_PARALLEL_FETCHES = 4
+
+# in fleet mode units due within this share of their interval are fetched along with their shard
+SHARD_COALESCE = 0.25
+
+# units are fetched a little early rather than waiting for a whole extra update interval
+SCHEDULE_TOLERANCE = timedelta(seconds=5)
+
+# rapid scan intervals without a new fix after which a moving unit counts as parked
+MOTION_QUIET_INTERVALS = 4
+
+UNITS_STORAGE_VERSION = 1
+# the unit list is written shortly after it changes
+UNITS_SAVE_DELAY = 10
+
+
+def _units_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[list[TrackingUnit]]:
+    return Store(hass, UNITS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.units")
+
+
+async def async_remove_stored_units(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the unit list stored for an entry."""
+
+    await _units_store(hass, entry).async_remove()
+
+
+def unit_unique_id(unit: TrackingUnit, key: str) -> str:
+    """Return the unique id of the entity showing a field of a unit."""
+    return f"{unit[PROP_VIN]}-{key}"
+
+
+def shard_of(unitnumber: str, shards: int) -> int:
+    """Return the shard of a unit, the same on every run."""
+    return crc32(unitnumber.encode()) % shards
+
 
 def parse_state_as_bool(state: bool | int | float | str) -> bool | None:
     """Interpret one of the many values the api provides for toggle states as a bool."""
@@ -65,29 +175,105 @@ def parse_state_as_date(state: datetime | str | Any | None) -> datetime | None:
     return value
 
 
+@dataclass
+class UnitsDiscovery:
+    """Units and validated client found by the config flow, handed off to the coordinator."""
+
+    client: ZeroApiClient
+    units: list[TrackingUnit]
+    time: datetime
+
+
+def store_units_discovery(hass: HomeAssistant, username: str, client: ZeroApiClient, units: list[TrackingUnit]):
+    """Keep the result of validating an account for the coordinator that will be set up for it."""
+
+    hass.data.setdefault(DATA_DISCOVERY, {})[username] = UnitsDiscovery(client, units, datetime.now())
+
+
+def pop_units_discovery(hass: HomeAssistant, username: str | None) -> UnitsDiscovery | None:
+    """Take the recent result of validating an account, if there is one."""
+
+    discovery: UnitsDiscovery | None = hass.data.get(DATA_DISCOVERY, {}).pop(username, None)
+    if discovery and datetime.now() - discovery.time <= DISCOVERY_MAX_AGE:
+        return discovery
+    return None
+
+
 class UnitScanState:
     """Thingy."""
 
-    enable_rapid_scan: bool = False
-    rapid_scan_auto_enabled: bool = False
-    update_now: bool = True
-    data_last_updated_time: datetime = datetime.min
+    __slots__ = (
+        "enable_rapid_scan",
+        "rapid_scan_auto_enabled",
+        "update_now",
+        "data_last_updated_time",
+        "parked_since",
+        "deep_idle",
+        "drifted",
+        "storage",
+        "alert_until",
+        "drain",
+        "alerts",
+        "profile",
+        "riding",
+        "charging",
+        "motion",
+        "stale",
+        "address",
+        "deltas",
+        "shard",
+        "track",
+    )
+
+    def __init__(self, profile: ScanProfile = SCAN_PROFILES[PROFILE_DEFAULT], shard: int = 0) -> None:
+        """Start with a fetch as soon as possible, and give every unit its own drain monitor and alert tracker."""
+        self.profile = profile
+        self.shard = shard
+        self.enable_rapid_scan: bool = False
+        self.rapid_scan_auto_enabled: bool = False
+        self.update_now: bool = True
+        self.data_last_updated_time: datetime = datetime.min
+        self.parked_since: datetime | None = None
+        self.deep_idle: bool = False
+        # left deep idle because its drain drifted, storage alone no longer puts it back
+        self.drifted: bool = False
+        self.storage: bool | None = None
+        self.alert_until: datetime = datetime.min
+        self.riding: bool = False
+        self.charging: bool = False
+        self.drain = DrainMonitor()
+        self.alerts = AlertTracker()
+        self.motion = MotionTracker()
+        # field groups older than their threshold
+        self.stale: frozenset[str] = frozenset()
+        # address of the geohash cell of the last fix
+        self.address: str | None = None
+        # recent changes for diagnostics
+        self.deltas = UnitDeltaLog()
+        # recent fixes for the track view
+        self.track = UnitTrack()
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class ZeroCoordinator(DataUpdateCoordinator[dict[str, TrackingUnitState] | None]):
-    """Class to manage fetching data from API."""
+class ZeroCoordinator(DataUpdateCoordinator[Mapping[str, TrackingUnitState] | None]):
+    """Class to manage fetching data from API.
 
-    entry: ConfigEntry | None = None
-    client: ZeroApiClient | None = None
-    units: list[TrackingUnit] = []
-    units_last_updated_time: datetime = datetime.min
+    The units, their scan states and the data are snapshots that are replaced as a
+    whole rather than changed in place, so code iterating one across an await keeps
+    a consistent view. Scan states themselves are only changed from the event loop.
+    """
+
+    client: ZeroApiClient | None
+    units: tuple[TrackingUnit, ...]
+    units_last_updated_time: datetime
     refresh_units_interval = timedelta(hours=12)
-    units_scan_state: dict[str, UnitScanState] = {}
+    units_scan_state: Mapping[str, UnitScanState]
     scan_interval: timedelta = DEFAULT_SCAN_INTERVAL
     rapid_scan_interval: timedelta = DEFAULT_RAPID_SCAN_INTERVAL
+    deep_idle_scan_interval: timedelta = DEFAULT_DEEP_IDLE_SCAN_INTERVAL
 
     data_timestamp: datetime | None = None
+    profiler: RefreshProfiler | None = None
 
     def __init__(
         self,
@@ -96,6 +282,10 @@ class ZeroCoordinator(DataUpdateCoordinator[dict[str, TrackingUnitState] | None]
     ) -> None:
         """Initialize."""
         self.configEntry = configEntry
+        self.client = None
+        self.units = ()
+        self.units_last_updated_time = datetime.min
+        self.units_scan_state = MappingProxyType({})
 
         options = OPTIONS_VALIDATOR_SCHEMA(dict(configEntry.options))
         self.scan_interval = options.get(
@@ -106,16 +296,153 @@ class ZeroCoordinator(DataUpdateCoordinator[dict[str, TrackingUnitState] | None]
             CONF_RAPID_SCAN_INTERVAL,
             DEFAULT_RAPID_SCAN_INTERVAL,
         )
+        self.deep_idle_scan_interval = options.get(
+            CONF_DEEP_IDLE_SCAN_INTERVAL,
+            DEFAULT_DEEP_IDLE_SCAN_INTERVAL,
+        )
+
+        self.record_file: str | None = options.get(CONF_RECORD_FILE) or None
+        self.replay_file: str | None = options.get(CONF_REPLAY_FILE) or None
+        self.replay_speed: float = options[CONF_REPLAY_SPEED]
+        # every interval and age is measured on this clock, replays run it replay_speed times as fast
+        self.clock: Clock = ReplayClock(self.replay_speed) if self.replay_file else Clock()
+        self.unit_profiles = unit_profiles(options)
+        self.budget = RequestBudget(
+            hass,
+            configEntry,
+            hourly_limit=options[CONF_HOURLY_REQUEST_LIMIT],
+            daily_limit=options[CONF_DAILY_REQUEST_LIMIT],
+            clock=self.clock.time,
+        )
+        self.statistics_only: bool = options[CONF_STATISTICS_ONLY]
+        self.statistics = HighChurnStatistics(hass, configEntry) if self.statistics_only else None
+        # aggregates over all units, rebuilt with every refresh
+        self.fleet = FleetSummary()
+        self.push_webhook: bool = options[CONF_PUSH_WEBHOOK]
+        self.fleet_shards: int = options[CONF_FLEET_SHARDS]
+        self.addresses = AddressCache(hass, configEntry)
+        self.log = UnitLog()
+        self.latency = LatencyTracker()
+        self.capabilities = CapabilityMap(hass, configEntry)
+        self.energy = EnergyEstimator(hass, configEntry)
+        self.stale_after: dict[str, timedelta] = {
+            GROUP_GPS: options[CONF_GPS_STALE_AFTER],
+            GROUP_TELEMETRY: options[CONF_TELEMETRY_STALE_AFTER],
+        }
+
+        LOGGER.debug("set scan interval to %s, rapid %s, deep idle %s", self.scan_interval, self.rapid_scan_interval, self.deep_idle_scan_interval)
 
-        LOGGER.debug("set scan interval to %s, rapid %s", self.scan_interval, self.rapid_scan_interval)
+        self._units_refresh_task: asyncio.Task | None = None
+        self._units_listeners: list[Callable[[list[TrackingUnit] | None], None]] = []
+        self._units_store = _units_store(hass, configEntry)
+        self._device_info: dict[str, DeviceInfo] = {}
+        self._timestamp_attributes: dict[str, tuple[Any, MappingProxyType]] = {}
+        # units whose entities need writing on the next listener update, None writes all of them
+        self._changed_units: set[str] | None = None
+        # listeners indexed by unit, so writing a unit doesn't go over the listeners of the whole fleet
+        self._unit_listeners: dict[str, set[Callable[[], None]]] = {}
+        self._account_listeners: set[Callable[[], None]] = set()
+        self._written_update_success: bool | None = None
+
+        # reuse the client and units from the config flow when the entry was just created
+        discovery = pop_units_discovery(hass, configEntry.data.get(CONF_USERNAME))
+        if discovery and not self.record_file and not self.replay_file:
+            LOGGER.debug("reusing %d units found while setting up %s", len(discovery.units), configEntry.title)
+            self.client = discovery.client
+            self.set_units(discovery.units, discovery.time)
 
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=configEntry.title,
-            update_interval=self.rapid_scan_interval,
+            update_interval=self.rapid_scan_interval / self.clock.speed,
+        )
+
+    def _create_client(self, username: str, password: str) -> ZeroApiClient:
+        """Create the api client, replaying or recording responses when configured."""
+
+        if self.replay_file:
+            LOGGER.info("replaying api responses from %s at %sx speed", self.replay_file, self.replay_speed)
+            return ZeroReplayApiClient(self.hass.config.path(self.replay_file), self.clock)
+        if self.record_file:
+            LOGGER.info("recording api responses to %s", self.record_file)
+            return ZeroRecordingApiClient(
+                username=username,
+                password=password,
+                session=async_get_clientsession(self.hass),
+                path=self.hass.config.path(self.record_file),
+            )
+        return ZeroApiClient(
+            username=username,
+            password=password,
+            session=async_get_clientsession(self.hass),
         )
 
+    def set_profiler(self, profiler: RefreshProfiler | None):
+        """Start or stop timing the stages of each refresh."""
+
+        self.profiler = profiler
+        if self.client:
+            self.client.profiler = profiler
+
+    def _span(self, name: str) -> AbstractContextManager:
+        return self.profiler.span(name) if self.profiler else nullcontext()
+
+    def mark_all_units_due(self):
+        """Have the next refresh fetch every unit, regardless of their scan interval."""
+
+        for scan_state in self.units_scan_state.values():
+            scan_state.update_now = True
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of units with new data or a change in staleness, timing the entity writes while profiling."""
+
+        changed_units, self._changed_units = self._changed_units, None
+        with self._span("entity_writes"):
+            # availability of every entity follows the update success
+            if changed_units is None or self.last_update_success != self._written_update_success:
+                self._written_update_success = self.last_update_success
+                super().async_update_listeners()
+                return
+
+            for update_callback in list(self._account_listeners):
+                update_callback()
+            for unitnumber in changed_units:
+                for update_callback in list(self._unit_listeners.get(unitnumber, ())):
+                    update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None], context: Any = None) -> Callable[[], None]:
+        """Listen for data updates, unit entities listen with their unit number as context and account entities without."""
+
+        remove_listener = super().async_add_listener(update_callback, context)
+        listeners = self._account_listeners if context is None else self._unit_listeners.setdefault(context, set())
+        listeners.add(update_callback)
+
+        @callback
+        def remove_indexed_listener() -> None:
+            remove_listener()
+            listeners.discard(update_callback)
+
+        return remove_indexed_listener
+
+    def is_stale(self, unitnumber: str, group: str) -> bool:
+        """Check if a field group of a unit is older than its threshold."""
+
+        scan_state = self.units_scan_state.get(unitnumber)
+        return group in scan_state.stale if scan_state else False
+
+    def update_staleness(self, data: Mapping[str, TrackingUnitState], changed_units: set[str]):
+        """Age the field groups of every unit, units whose stale groups changed need their entities written."""
+
+        time_now = self.clock.utcnow()
+        for unitnumber, scan_state in self.units_scan_state.items():
+            stale = stale_groups(data.get(unitnumber), time_now, self.stale_after)
+            if stale != scan_state.stale:
+                scan_state.stale = stale
+                changed_units.add(unitnumber)
+
     def is_rapid_scan_enabled(self, unit: TrackingUnit) -> bool:
         """Do thing."""
 
@@ -134,79 +461,672 @@ class ZeroCoordinator(DataUpdateCoordinator[dict[str, TrackingUnitState] | None]
         scan_state = self.units_scan_state.get(unit.get('unitnumber', ""))
         if scan_state:
             scan_state.enable_rapid_scan = value
-            LOGGER.debug("rapid scan is now %s for %s", value, unit)
-            self.update_interval = self.rapid_scan_interval
+            scan_state.update_now = value
+            LOGGER.debug("rapid scan is now %s for %s", value, unit.get('unitnumber'))
+            self.update_interval = self.unit_rapid_scan_interval(scan_state) / self.clock.speed
         else:
-            LOGGER.warning("failed to enable rapid scan: %s is unknown", unit)
+            LOGGER.warning("failed to enable rapid scan: %s is unknown", unit.get('unitnumber'))
         # return self.async_request_refresh()
 
+    def motion(self, unit: TrackingUnit) -> MotionTracker | None:
+        """Return the motion derived from the fixes of a unit."""
+
+        scan_state = self.units_scan_state.get(unit.get('unitnumber', ""))
+        return scan_state.motion if scan_state else None
+
+    def drain_rate(self, unit: TrackingUnit, key: TrackingUnitStateKeys) -> float | None:
+        """Return the drain per hour of a signal while the unit is parked."""
+
+        scan_state = self.units_scan_state.get(unit.get('unitnumber', ""))
+        return scan_state.drain.rate(key) if scan_state else None
+
+    def unit_profile(self, unitnumber: str) -> ScanProfile:
+        """Return the scan profile assigned to a unit in the options."""
+
+        return self.unit_profiles.get(unitnumber, SCAN_PROFILES[PROFILE_DEFAULT])
+
+    def unit_rapid_scan_interval(self, scan_state: UnitScanState) -> timedelta:
+        """Return the rapid scan interval of a unit's profile."""
+
+        return scan_state.profile.rapid_scan_interval or self.rapid_scan_interval
+
+    def unit_scan_interval(self, scan_state: UnitScanState, time_now: datetime) -> timedelta:
+        """Return the interval at which a unit should be polled given its current state."""
+
+        profile = scan_state.profile
+        if scan_state.alert_until > time_now:
+            return self.unit_rapid_scan_interval(scan_state)
+        if scan_state.enable_rapid_scan or scan_state.rapid_scan_auto_enabled or scan_state.motion.moving:
+            return self.unit_rapid_scan_interval(scan_state)
+        if scan_state.deep_idle:
+            return profile.deep_idle_scan_interval or self.deep_idle_scan_interval
+        return profile.scan_interval or self.scan_interval
+
+    def is_unit_due(self, scan_state: UnitScanState, time_now: datetime, coalesce: bool = False) -> bool:
+        """Check if a unit's scan interval has passed since it was last fetched, or nearly has when coalescing."""
+
+        if scan_state.update_now:
+            return True
+        elapsed = time_now - scan_state.data_last_updated_time
+        interval = self.unit_scan_interval(scan_state, time_now)
+        tolerance = max(SCHEDULE_TOLERANCE, interval * SHARD_COALESCE) if coalesce else SCHEDULE_TOLERANCE
+        return elapsed >= interval - tolerance
+
+    def due_units(self, time_now: datetime) -> list[tuple[int, TrackingUnit, UnitScanState]]:
+        """Return the priority, unit and scan state of the units to fetch, highest priority first.
+
+        In fleet mode the units of a shard with a due unit that are nearly due are
+        fetched along, the units of a shard stay in step and wake the coordinator once.
+        """
+
+        units = [
+            (unit, scan_state)
+            for unit in self.units
+            if (scan_state := self.units_scan_state.get(unit["unitnumber"]))
+        ]
+        due = [(unit, scan_state) for unit, scan_state in units if self.is_unit_due(scan_state, time_now)]
+        if self.fleet_shards > 1 and due:
+            due_shards = {scan_state.shard for _, scan_state in due}
+            due = [
+                (unit, scan_state)
+                for unit, scan_state in units
+                if self.is_unit_due(scan_state, time_now, coalesce=scan_state.shard in due_shards)
+            ]
+
+        # riding units and units with alerts go first, parked ones are put off when the budget runs low
+        return sorted(
+            ((self.unit_priority(scan_state, time_now), unit, scan_state) for unit, scan_state in due),
+            key=itemgetter(0),
+        )
+
+    def unit_priority(self, scan_state: UnitScanState, time_now: datetime) -> int:
+        """Return the priority of fetching a unit when the request budget runs low."""
+
+        if scan_state.alert_until > time_now or scan_state.enable_rapid_scan or scan_state.riding or scan_state.motion.moving:
+            return PRIORITY_ALERT_OR_RIDING
+        if scan_state.charging:
+            return PRIORITY_CHARGING
+        return PRIORITY_PARKED
+
     def apply_scan_interval(self):
-        """Do thing."""
+        """Wake up when the next unit is due, but never sooner than the shortest rapid scan interval."""
 
-        new_interval = self.rapid_scan_interval if any((scan_state.enable_rapid_scan or scan_state.rapid_scan_auto_enabled) for scan_state in self.units_scan_state.values()) else self.scan_interval
+        time_now = self.clock.now()
+        new_interval = min(
+            (
+                self.unit_scan_interval(scan_state, time_now) - (time_now - scan_state.data_last_updated_time)
+                for scan_state in self.units_scan_state.values()
+            ),
+            default=self.scan_interval,
+        )
+        new_interval = max(
+            new_interval,
+            min(
+                (self.unit_rapid_scan_interval(scan_state) for scan_state in self.units_scan_state.values()),
+                default=self.rapid_scan_interval,
+            ),
+        )
+        # the interval is in replayed time, home assistant schedules in real time
+        new_interval /= self.clock.speed
         if new_interval != self.update_interval:
             LOGGER.debug("new update interval is %s", new_interval)
         self.update_interval = new_interval
 
-    async def _async_update_data(self) -> dict[str, TrackingUnitState]:
-        """Update data using API."""
+    def handle_alerts(self, unit: TrackingUnit, scan_state: UnitScanState, unit_state: TrackingUnitState, time_now: datetime):
+        """Announce newly raised safety alerts and keep the unit on rapid scan while any is active."""
+
+        active = frozenset(key for key in ALERT_KEYS if parse_state_as_bool(unit_state.get(key)))
+        raised = scan_state.alerts.update(active)
+        if active:
+            scan_state.alert_until = time_now + ALERT_RAPID_SCAN_DURATION
+        if raised:
+            LOGGER.warning("%s raised %s", unit['unitnumber'], ", ".join(sorted(raised)))
+            self.hass.bus.async_fire(
+                EVENT_ALERT,
+                {
+                    "unitnumber": unit['unitnumber'],
+                    "vin": unit[PROP_VIN],
+                    "alerts": sorted(raised),
+                    "latitude": unit_state.get('latitude'),
+                    "longitude": unit_state.get('longitude'),
+                    "datetime_actual": unit_state.get('datetime_actual'),
+                },
+            )
+
+    def update_motion(self, scan_state: UnitScanState, unit_state: TrackingUnitState, time_now: datetime):
+        """Feed the fix of a unit into its motion state machine and its track."""
+
+        fix_time = parse_state_as_date(unit_state.get('datetime_utc')) or time_now
+        home = (self.hass.config.latitude, self.hass.config.longitude)
+        scan_state.motion.update(unit_state, fix_time, home, time_now)
+        scan_state.track.add(unit_state, fix_time)
 
-        fetchedData: dict[str, TrackingUnitState] = {}
+    def settle_motion(self, scan_state: UnitScanState, unit_state: TrackingUnitState, time_now: datetime) -> bool:
+        """Stop a unit moving once it stands still with the ignition off or its fixes stop coming, checked on every fetch."""
 
+        try:
+            velocity = float(unit_state.get('velocity') or 0)
+        except (TypeError, ValueError):
+            velocity = 0.0
+        standing = not parse_state_as_bool_or(unit_state.get('ignition', False)) and velocity == 0
+        quiet_after = self.unit_rapid_scan_interval(scan_state) * MOTION_QUIET_INTERVALS
+        if scan_state.motion.settle(time_now, standing, quiet_after):
+            LOGGER.debug("%s stopped moving", unit_state.get('unitnumber'))
+            return True
+        return False
+
+    def unit_address(self, unitnumber: str) -> str | None:
+        """Return the cached address of the last fix of a unit."""
+
+        scan_state = self.units_scan_state.get(unitnumber)
+        return scan_state.address if scan_state else None
+
+    def update_address(self, scan_state: UnitScanState, unit_state: TrackingUnitState):
+        """Take the api address of the last fix, or the cached address of its cell when the api gives none."""
+
+        latitude, longitude = scan_state.motion.latitude, scan_state.motion.longitude
+        if latitude is None or longitude is None:
+            return
+
+        api_address = unit_state.get("address")
+        scan_state.address = self.addresses.address(latitude, longitude, str(api_address) if api_address else None)
+
+    def update_unit_tier(self, scan_state: UnitScanState, unit_state: TrackingUnitState, time_now: datetime, new_state: bool = True):
+        """Move a unit in or out of deep idle polling based on what it reported.
+
+        Also runs for a repeated payload, with new_state False, so the time spent parked keeps counting.
+        """
+
+        ignition = parse_state_as_bool_or(unit_state.get('ignition', False))
+        charging = parse_state_as_bool_or(unit_state.get('charging', False))
+        pluggedin = parse_state_as_bool_or(unit_state.get('pluggedin', False))
+        storage = parse_state_as_bool_or(unit_state.get('storage', False))
+        scan_state.riding = ignition
+        scan_state.charging = charging
+        scan_state.rapid_scan_auto_enabled = any(
+            parse_state_as_bool_or(unit_state.get(trigger, False))
+            for trigger in scan_state.profile.rapid_scan_triggers
+        )
+
+        storage_toggled = scan_state.storage is not None and storage != scan_state.storage
+        scan_state.storage = storage
+
+        if ignition or charging or pluggedin or storage_toggled:
+            if scan_state.deep_idle:
+                LOGGER.debug("%s is no longer parked, leaving deep idle", unit_state.get('unitnumber'))
+            scan_state.deep_idle = False
+            scan_state.drifted = False
+            scan_state.parked_since = time_now if storage_toggled else None
+            scan_state.drain.reset()
+            return
+
+        # a repeated payload would drift away from the trend by itself
+        if new_state and scan_state.deep_idle and scan_state.drain.drifted(unit_state, time_now):
+            LOGGER.debug("%s drifted from its drain trend, leaving deep idle", unit_state.get('unitnumber'))
+            scan_state.deep_idle = False
+            scan_state.drifted = True
+            scan_state.parked_since = time_now
+            scan_state.drain.reset()
+
+        scan_state.drain.add_sample(unit_state, time_now)
+
+        if scan_state.parked_since is None:
+            scan_state.parked_since = time_now
+        # after a drift a stored unit is polled normally until it has been quiet for DEEP_IDLE_AFTER again
+        if not scan_state.deep_idle and (
+            (storage and not scan_state.drifted) or time_now - scan_state.parked_since >= DEEP_IDLE_AFTER
+        ):
+            LOGGER.debug("%s is parked, entering deep idle", unit_state.get('unitnumber'))
+            scan_state.deep_idle = True
+
+    def device_info(self, unit: TrackingUnit) -> DeviceInfo:
+        """Return the device info of a unit, one instance is shared by all of its entities."""
+
+        unitnumber = unit['unitnumber']
+        device_info = self._device_info.get(unitnumber)
+        if device_info is None:
+            unit_state = self.data.get(unitnumber) if self.data else None
+            software_version = unit_state.get("software_version") if unit_state else None
+            device_info = self._device_info[unitnumber] = DeviceInfo(
+                identifiers={(DOMAIN, sys.intern(unit[PROP_VIN]))},
+                name=sys.intern(unitnumber),
+                model=unit.get("vehiclemodel", None),
+                manufacturer=BRAND,
+                sw_version=str(software_version) if software_version else None,
+            )
+        return device_info
+
+    def update_software_version(self, unit: TrackingUnit, unit_state: TrackingUnitState):
+        """Keep the firmware version of the device current, the device is created before any data is known."""
+
+        software_version = unit_state.get("software_version")
+        if not software_version:
+            return
+        device_info = self.device_info(unit)
+        if device_info.get("sw_version") == str(software_version):
+            return
+
+        device_info["sw_version"] = str(software_version)
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(identifiers={(DOMAIN, unit[PROP_VIN])}):
+            device_registry.async_update_device(device.id, sw_version=str(software_version))
+
+    def timestamp_attributes(self, unitnumber: str) -> MappingProxyType:
+        """Return the timestamp attributes of a unit, the same mapping is reused until the unit sends new data."""
+
+        datetime_data = self.data.get(unitnumber, {}).get("datetime_actual") if self.data else None
+        cached = self._timestamp_attributes.get(unitnumber)
+        if cached is None or cached[0] != datetime_data:
+            cached = self._timestamp_attributes[unitnumber] = (
+                datetime_data,
+                MappingProxyType({"timestamp": parse_state_as_date(datetime_data)}),
+            )
+        return cached[1]
+
+    @callback
+    def async_add_units_listener(self, update_callback: Callable[[list[TrackingUnit] | None], None]) -> Callable[[], None]:
+        """Listen for units whose entities may have changed, returns a function to stop listening.
+
+        The listener gets the units that changed, or None when units were added to or removed from the account.
+        """
+
+        self._units_listeners.append(update_callback)
+
+        @callback
+        def remove_units_listener() -> None:
+            self._units_listeners.remove(update_callback)
+
+        return remove_units_listener
+
+    def set_units(self, units: list[TrackingUnit], time: datetime):
+        """Publish a new snapshot of the units, keeping the scan state of the units that are still there."""
+
+        previous_units = {unit['unitnumber']: unit for unit in self.units}
+        scan_states = {
+            unit['unitnumber']: self.units_scan_state.get(unit['unitnumber']) or UnitScanState(
+                self.unit_profile(unit['unitnumber']),
+                shard_of(unit['unitnumber'], self.fleet_shards),
+            )
+            for unit in units
+        }
+        self.units = tuple(units)
+        self.units_scan_state = MappingProxyType(scan_states)
+        self.units_last_updated_time = time
+
+        self._units_store.async_delay_save(lambda: list(self.units), UNITS_SAVE_DELAY)
+
+        added = [unit for unit in units if unit['unitnumber'] not in previous_units]
+        removed = [unit for unitnumber, unit in previous_units.items() if unitnumber not in self.units_scan_state]
+        for unit in removed:
+            self._device_info.pop(unit['unitnumber'], None)
+            self._timestamp_attributes.pop(unit['unitnumber'], None)
+            self.log.forget(unit['unitnumber'])
+            self.capabilities.forget(unit['unitnumber'])
+        if previous_units and (added or removed):
+            self._async_reconcile_units(added, removed)
+
+    @callback
+    def _async_reconcile_units(self, added: list[TrackingUnit], removed: list[TrackingUnit]):
+        """Add entities for new units and remove the devices, and with them the entities, of units that are gone."""
+
+        LOGGER.debug("units changed, %d added and %d removed", len(added), len(removed))
+        for update_callback in list(self._units_listeners):
+            update_callback(None)
+
+        device_registry = dr.async_get(self.hass)
+        for unit in removed:
+            device = device_registry.async_get_device(identifiers={(DOMAIN, unit[PROP_VIN])})
+            if device:
+                device_registry.async_update_device(
+                    device.id,
+                    remove_config_entry_id=self.configEntry.entry_id,
+                )
+
+    def supports(self, unit: TrackingUnit, key: str) -> bool:
+        """Check if a unit reports a field, decides if the entity of the field is created."""
+
+        return self.capabilities.supports(unit["unitnumber"], key)
+
+    @callback
+    def async_update_unsupported_entities(self, units: list[TrackingUnit] | None = None):
+        """Disable the entities of fields the units turned out not to report, and enable them once they do, of all units by default.
+
+        Entities are disabled rather than removed, so fields a unit only reports now and then keep
+        their customizations. Only entities this integration disabled are enabled again.
+        """
+
+        entity_registry = er.async_get(self.hass)
+        for unit in self.units if units is None else units:
+            if not self.capabilities.is_learned(unit["unitnumber"]):
+                continue
+            for key in STATE_KEYS:
+                # these are disabled and enabled by the statistics only option
+                if self.statistics_only and key in HIGH_CHURN_KEYS:
+                    continue
+                supported = self.capabilities.supports(unit["unitnumber"], key)
+                for domain in (Platform.SENSOR, Platform.BINARY_SENSOR):
+                    entity_id = entity_registry.async_get_entity_id(domain, DOMAIN, unit_unique_id(unit, key))
+                    if entity_id is None:
+                        continue
+                    disabled_by = entity_registry.async_get(entity_id).disabled_by
+                    if not supported and disabled_by is None:
+                        LOGGER.debug("disabling %s, its unit doesn't report it", entity_id)
+                        entity_registry.async_update_entity(entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION)
+                    elif supported and disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+                        LOGGER.debug("enabling %s, its unit reports it again", entity_id)
+                        entity_registry.async_update_entity(entity_id, disabled_by=None)
+
+    @callback
+    def _async_capabilities_changed(self, unit: TrackingUnit):
+        self.async_update_unsupported_entities([unit])
+        # fields showing up later on get their entities added
+        for update_callback in list(self._units_listeners):
+            update_callback([unit])
+
+    def _ensure_client(self):
+        """Create the api client from the stored credentials if there isn't one yet."""
+
+        if self.client:
+            return
+
+        # Retrieve the stored credentials from config-flow
+        username = self.configEntry.data.get(CONF_USERNAME)
+        LOGGER.debug("Loaded %s: %s", CONF_USERNAME, username)
+        password = self.configEntry.data.get(CONF_PASSWORD)
+        LOGGER.debug("Loadded %s: ********", CONF_PASSWORD)
+
+        self.client = self._create_client(username, password) if username and password else None
+        if self.client:
+            self.client.profiler = self.profiler
+
+    async def async_setup_units(self):
+        """Get the units of the account so entities can be created before any of their data is fetched.
+
+        The units stored by the last run are used when there are any, they get refreshed in the
+        background with the first update. Otherwise only the unit list is fetched.
+        """
+
+        if self.units:
+            return
+
+        stored_units = await self._units_store.async_load()
+        if stored_units:
+            LOGGER.debug("using %d stored units for %s", len(stored_units), self.configEntry.title)
+            self.set_units(stored_units, datetime.min)
+            return
+
+        self._ensure_client()
         if not self.client:
-            # Retrieve the stored credentials from config-flow
-            username = self.configEntry.data.get(CONF_USERNAME)
-            LOGGER.debug("Loaded %s: %s", CONF_USERNAME, username)
-            password = self.configEntry.data.get(CONF_PASSWORD)
-            LOGGER.debug("Loadded %s: ********", CONF_PASSWORD)
+            raise ConfigEntryNotReady("Remote api client isn't available, unknown error")
+        try:
+            await self._async_update_units(self.clock.now())
+        except UpdateFailed as exception:
+            raise ConfigEntryNotReady(exception) from exception
 
-            self.client = ZeroApiClient(
-                username=username,
-                password=password,
-                session=async_get_clientsession(self.hass),
-            ) if username and password else None
+    async def _async_update_units(self, time_now: datetime):
+        """Fetch the units of the account, this blocks the update until they are known."""
+
+        if not self.budget.allows(PRIORITY_ALERT_OR_RIDING):
+            raise UpdateFailed("The request budget is used up, the units are fetched once it allows")
+        self.units_last_updated_time = time_now
+        self.budget.spend()
+        try:
+            units = await self.client.async_get_units()
+        except ZeroApiClientAuthenticationError as exception:
+            raise ConfigEntryAuthFailed(exception) from exception
+        except ZeroApiClientError as exception:
+            raise UpdateFailed(exception) from exception
+
+        LOGGER.debug("received %d units from API", len(units))
+        self.set_units(units, time_now)
+
+    async def _async_refresh_units(self, time_now: datetime):
+        """Refresh the units of the account while fetches continue with the units we already know."""
+
+        try:
+            await self._async_update_units(time_now)
+        except ConfigEntryAuthFailed as exception:
+            LOGGER.warning("failed to refresh units, the credentials were rejected: %s", exception)
+            # raised outside of a refresh, so the coordinator doesn't start the reauth flow by itself
+            self.configEntry.async_start_reauth(self.hass)
+        except UpdateFailed as exception:
+            self.log.warning(self.configEntry.entry_id, "units_refresh", "failed to refresh units, keeping the %d known units: %s", len(self.units), exception)
+        finally:
+            self._units_refresh_task = None
+
+    def process_unit_state(self, unit: TrackingUnit, scan_state: UnitScanState, unit_state: TrackingUnitState, time_now: datetime):
+        """Run the per unit processing on newly received data, polled or pushed."""
+
+        with self._span("process"):
+            # alerts go first, nothing else may hold them up
+            self.handle_alerts(unit, scan_state, unit_state, time_now)
+            scan_state.deltas.add(time_now, unit_state)
+            if self.capabilities.learn(unit["unitnumber"], unit_state):
+                self._async_capabilities_changed(unit)
+            self.update_motion(scan_state, unit_state, time_now)
+            self.settle_motion(scan_state, unit_state, time_now)
+            self.update_address(scan_state, unit_state)
+            if self.statistics:
+                self.statistics.add(unit, unit_state)
+            self.update_unit_tier(scan_state, unit_state, time_now)
+            self.update_software_version(unit, unit_state)
+            # uses the charging state parsed by update_unit_tier
+            self.energy.add(unit, unit_state, scan_state.charging)
+
+    @callback
+    def async_push_unit_states(self, unit_states: list[TrackingUnitState]) -> int:
+        """Take unit data pushed to the webhook as if it was just polled, return the number of states used.
+
+        The pushed units count as updated, so they are only polled again when their interval has passed.
+        """
+
+        units = {unit["unitnumber"]: unit for unit in self.units}
+        data: dict[str, TrackingUnitState] = dict(self.data) if self.data else {}
+        timeNow = self.clock.now()
+        changed_units: set[str] = set()
+
+        for unit_state in unit_states:
+            unitnumber = str(unit_state.get("unitnumber"))
+            unit = units.get(unitnumber)
+            scan_state = self.units_scan_state.get(unitnumber)
+            if not unit or not scan_state:
+                LOGGER.debug("ignoring pushed data for unknown unit %s", unitnumber)
+                continue
+
+            if not is_newer(unit_state, data.get(unitnumber)):
+                LOGGER.debug("ignoring pushed data for %s, it isn't newer than the data held", unitnumber)
+                continue
+
+            scan_state.data_last_updated_time = timeNow
+            scan_state.update_now = False
+            data[unitnumber] = unit_state
+            self.process_unit_state(unit, scan_state, unit_state, timeNow)
+            changed_units.add(unitnumber)
+
+        if changed_units:
+            with self._span("fleet"):
+                self.fleet = summarize_fleet(data, self.units_scan_state)
+            self.update_staleness(data, changed_units)
+            self.apply_scan_interval()
+            self._changed_units = changed_units
+            # not async_set_updated_data, that would put off the next poll of every unit and drop a requested refresh
+            self.data = MappingProxyType(data)
+            self.async_update_listeners()
+
+        return len(changed_units)
+
+    async def _async_fetch_unit(self, unitnumber: str, semaphore: asyncio.Semaphore, timeout: float) -> TrackingUnitState:
+        async with semaphore:
+            started = monotonic()
+            try:
+                unit_state = await self.client.async_get_last_transmit(unitnumber, timeout)
+            except ZeroApiClientCommunicationError as exception:
+                # a timed out request counts with its timeout, so the timeout grows when the api slows down
+                if isinstance(exception.__cause__, TimeoutError):
+                    self.latency.add(timeout)
+                raise
+            self.latency.add(monotonic() - started)
+            return unit_state
+
+    def _use_fetched_state(
+        self,
+        unit: TrackingUnit,
+        scan_state: UnitScanState,
+        unit_state: TrackingUnitState,
+        fetched: dict[str, TrackingUnitState],
+        time_now: datetime,
+    ) -> bool:
+        """Process a fetched unit state unless the unit is gone or the state isn't newer than the data held now, return whether the unit changed."""
+
+        unitnumber = unit["unitnumber"]
+        # out of order or repeated responses, or data pushed meanwhile, would only rewrite the same states
+        held = self.data.get(unitnumber) if self.data else None
+        if unitnumber not in self.units_scan_state:
+            return False
+        if not is_newer(unit_state, held):
+            self.log.sampled_debug("not_newer", "no newer data for %s", unitnumber)
+            # a unit that keeps sending its last transmission still stops moving and gets to deep idle
+            settled = self.settle_motion(scan_state, unit_state, time_now)
+            self.update_unit_tier(scan_state, unit_state, time_now, new_state=False)
+            return settled
+
+        fetched[unitnumber] = unit_state
+        self.process_unit_state(unit, scan_state, unit_state, time_now)
+        return True
+
+    def cycle_budget(self) -> float:
+        """Return the seconds a refresh may spend fetching, a share of the update interval."""
+        interval = self.update_interval.total_seconds() if self.update_interval else 0
+        # at least one request gets to finish
+        return max(interval * CYCLE_BUDGET_SHARE, self.latency.timeout())
+
+    async def _async_update_data(self) -> Mapping[str, TrackingUnitState]:
+        """Update data using API."""
+
+        self._ensure_client()
 
         if self.client:
-            timeNow = datetime.now()
-            if len(self.units) == 0 or (timeNow - self.units_last_updated_time) >= self.refresh_units_interval:
-                self.units_last_updated_time = timeNow
-                try:
-                    self.units = await self.client.async_get_units()
-                except ZeroApiClientAuthenticationError as exception:
-                    raise ConfigEntryAuthFailed(exception) from exception
-                except ZeroApiClientError as exception:
-                    raise UpdateFailed(exception) from exception
-
-                LOGGER.debug("received units from API %s", self.units)
-
-                updated_scan_state: dict[str, UnitScanState] = {}
-                for unit in self.units:
-                    unitnumber = unit['unitnumber']
-                    updated_scan_state[unitnumber] = self.units_scan_state.get(unitnumber, UnitScanState())
-                self.units_scan_state = updated_scan_state
-
-            for unit in self.units:
-                unitnumber = unit["unitnumber"]
-                scan_state = self.units_scan_state.get(
-                    unitnumber,
-                    UnitScanState()
+            timeNow = self.clock.now()
+            # fetches still running at the deadline are cancelled, so refreshes don't drift past their interval
+            deadline = monotonic() + self.cycle_budget()
+            if len(self.units) == 0:
+                await self._async_update_units(timeNow)
+            # the known units do fine until there is budget to spare
+            elif (
+                (timeNow - self.units_last_updated_time) >= self.refresh_units_interval
+                and not self._units_refresh_task
+                and self.budget.allows(PRIORITY_PARKED)
+            ):
+                self._units_refresh_task = self.configEntry.async_create_background_task(
+                    self.hass,
+                    self._async_refresh_units(timeNow),
+                    f"{DOMAIN} units refresh",
                 )
-                LOGGER.debug("fetching data for %s", unitnumber)
+
+            due_units = self.due_units(timeNow)
+            self.budget.deferred = 0
+            changed_units: set[str] = set()
+
+            fetches: list[tuple[TrackingUnit, UnitScanState, datetime, bool]] = []
+            for priority, unit, scan_state in due_units:
+                if not self.budget.allows(priority):
+                    self.budget.deferred += 1
+                    continue
+
+                self.budget.spend()
+                self.log.sampled_debug("fetch", "fetching data for %s", unit["unitnumber"])
+                # restored when the fetch fails or is cut off at the deadline
+                fetches.append((unit, scan_state, scan_state.data_last_updated_time, scan_state.update_now))
+                # cleared before the fetch, so a switch turned on meanwhile still gets its update
                 scan_state.data_last_updated_time = timeNow
                 scan_state.update_now = False
-                try:
-                    fetchedData[unitnumber] = await self.client.async_get_last_transmit(unitnumber)
-                    ignition = parse_state_as_bool(fetchedData[unitnumber].get('ignition', False))
-                    charging = parse_state_as_bool(fetchedData[unitnumber].get('charging', False))
-                    scan_state.rapid_scan_auto_enabled = (ignition if ignition else False) or (charging if charging else False)
-                except ZeroApiClientAuthenticationError as exception:
-                    raise ConfigEntryAuthFailed(exception) from exception
-                except ZeroApiClientError as exception:
-                    raise UpdateFailed(exception) from exception
-
-                self.apply_scan_interval()
+
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+            timeout = self.latency.timeout()
+            tasks = {
+                asyncio.create_task(self._async_fetch_unit(fetch[0]["unitnumber"], semaphore, timeout)): fetch
+                for fetch in fetches
+            }
+            fetched: dict[str, TrackingUnitState] = {}
+            errors: list[BaseException] = []
+            timed_out = 0
+            succeeded = 0
+            pending = set(tasks)
+            done: set[asyncio.Task] = set()
+            try:
+                # results are used as they come in, an alert doesn't wait for the slowest unit
+                while pending and (remaining := deadline - monotonic()) > 0:
+                    done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                    while done:
+                        task = done.pop()
+                        unit, scan_state, last_updated_time, update_now = tasks[task]
+                        if (error := task.exception()) is not None:
+                            # fetched again next refresh, the other units keep their results
+                            scan_state.data_last_updated_time = last_updated_time
+                            scan_state.update_now = update_now
+                            # a slow unit is cut off like the ones still running at the deadline
+                            if isinstance(error, ZeroApiClientCommunicationError) and isinstance(error.__cause__, TimeoutError):
+                                timed_out += 1
+                                self.log.sampled_debug("timeout", "fetching %s timed out after %.1fs", unit["unitnumber"], timeout)
+                                continue
+                            errors.append(error)
+                            self.log.warning(unit["unitnumber"], "fetch", "failed to fetch %s: %s", unit["unitnumber"], error)
+                            continue
+                        succeeded += 1
+                        if self._use_fetched_state(unit, scan_state, task.result(), fetched, timeNow):
+                            changed_units.add(unit["unitnumber"])
+            finally:
+                # still running at the deadline, or left behind when the refresh is cancelled or fails,
+                # these are fetched first thing next refresh
+                unfinished = pending | done
+                for task in unfinished:
+                    task.cancel()
+                    _, scan_state, last_updated_time, update_now = tasks[task]
+                    scan_state.data_last_updated_time = last_updated_time
+                    scan_state.update_now = update_now
+                if unfinished:
+                    await asyncio.gather(*unfinished, return_exceptions=True)
+            self.latency.cut = len(pending) + timed_out
+
+            for error in errors:
+                if isinstance(error, ZeroApiClientAuthenticationError):
+                    raise ConfigEntryAuthFailed(error) from error
+            for error in errors:
+                if not isinstance(error, ZeroApiClientError):
+                    raise error
+            # a partial refresh still publishes the units that did respond
+            if fetches and not succeeded:
+                if errors:
+                    raise UpdateFailed(errors[0]) from errors[0]
+                raise UpdateFailed(f"none of {len(fetches)} units responded before timing out or the deadline")
+
+            # merged into the data held now, not a copy from before fetching, so data pushed to
+            # the webhook meanwhile is kept when it is newer, the units may have been refreshed too
+            units_scan_state = self.units_scan_state
+            data = {
+                unitnumber: unit_state
+                for unitnumber, unit_state in (self.data or {}).items()
+                if unitnumber in units_scan_state
+            }
+            for unitnumber, unit_state in fetched.items():
+                if unitnumber in units_scan_state and is_newer(unit_state, data.get(unitnumber)):
+                    data[unitnumber] = unit_state
+            with self._span("fleet"):
+                self.fleet = summarize_fleet(data, units_scan_state)
+
+            self.update_staleness(data, changed_units)
+            self.apply_scan_interval()
+            self._changed_units = changed_units
+            LOGGER.debug(
+                "%d of %d due units changed, %d deferred, %d cut off at the deadline or timed out",
+                len(changed_units),
+                len(due_units),
+                self.budget.deferred,
+                self.latency.cut,
+            )
 
         else:
             raise UpdateFailed("Remote api client isn't available, unknown error")
 
-        return fetchedData
+        # published as a whole, entities never see a half updated snapshot
+        return MappingProxyType(data)
@@ -0,0 +1,56 @@
+"""Log of the fields that changed between the payloads of a unit."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from sys import intern
+from typing import Any, Final
+
+from .api import TrackingUnitState
+
+# payloads kept per unit
+DELTA_LOG_LENGTH: Final = 50
+
+
+def _intern(value: Any) -> Any:
+    # the api repeats the same few strings, share one copy of each
+    return intern(value) if isinstance(value, str) else value
+
+
+class UnitDeltaLog:
+    """The changed fields of the last payloads of a unit, oldest first."""
+
+    __slots__ = ("_previous", "_entries")
+
+    def __init__(self, length: int = DELTA_LOG_LENGTH) -> None:
+        """Start without any payloads, the first one is logged in full."""
+        self._previous: TrackingUnitState = {}
+        self._entries: deque[tuple[datetime, tuple[tuple[str, Any], ...], tuple[str, ...]]] = deque(maxlen=length)
+
+    def add(self, time: datetime, unit_state: TrackingUnitState) -> None:
+        """Log the fields that were added, changed or removed since the previous payload."""
+        previous = self._previous
+        changed = tuple(
+            (_intern(key), _intern(value))
+            for key, value in unit_state.items()
+            if key not in previous or previous[key] != value
+        )
+        removed = tuple(_intern(key) for key in previous if key not in unit_state)
+        if changed or removed:
+            self._entries.append((time, changed, removed))
+        self._previous = unit_state
+
+    def __len__(self) -> int:
+        """Return the number of payloads logged."""
+        return len(self._entries)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the log in a json friendly form."""
+        return [
+            {
+                "time": time.isoformat(),
+                "changed": dict(changed),
+                **({"removed": list(removed)} if removed else {}),
+            }
+            for time, changed, removed in self._entries
+        ]
@@ -2,40 +2,48 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
+from functools import partial
 from typing import Any
 
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.components.device_tracker.const import SourceType
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_BATTERY_LEVEL, ATTR_LATITUDE, ATTR_LONGITUDE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .api import PROP_VIN, TrackingUnit
 from .const import DOMAIN, LOGGER
 from .coordinator import ZeroCoordinator, parse_state_as_bool
-from .entity import ZeroEntity
+from .entity import ZeroEntity, async_add_unit_entities
+from .freshness import GROUP_GPS
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities: entity_platform.AddEntitiesCallback):
     """Set up device tracket by config_entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    async_add_entities(
-        [
-            ZeroTrackerEntity(
-                coordinator=coordinator,
-                unit=unit,
-            )
-            for unit in coordinator.units
+    async_add_unit_entities(
+        coordinator,
+        async_add_entities,
+        lambda unit: [
+            (unit[PROP_VIN], partial(ZeroTrackerEntity, coordinator=coordinator, unit=unit)),
         ],
-        True
     )
 
-class ZeroTrackerEntity(ZeroEntity, TrackerEntity):
+class ZeroTrackerEntity(ZeroEntity, TrackerEntity, RestoreEntity):
     """A class representing a trackable device."""
 
     _attr_force_update = False
     _attr_name = None
+    field_group = GROUP_GPS
+
+    # change on every poll while riding, their history is kept by the sensors
+    _unrecorded_attributes = frozenset({"heading", "velocity", "altitude", "datetime_utc"})
+
+    # position from before the restart, used until the first update
+    _restored: Mapping[str, Any] = {}
 
     def __init__(
         self,
@@ -48,20 +56,36 @@ class ZeroTrackerEntity(ZeroEntity, TrackerEntity):
         self._attr_unique_id = unit[PROP_VIN]
         LOGGER.debug("init tracker for %s", self.unitnumber)
 
+    async def async_added_to_hass(self) -> None:
+        """Restore the last position while the first update runs in the background."""
+        await super().async_added_to_hass()
+
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._restored = {
+                "soc": last_state.attributes.get(ATTR_BATTERY_LEVEL),
+                "latitude": last_state.attributes.get(ATTR_LATITUDE),
+                "longitude": last_state.attributes.get(ATTR_LONGITUDE),
+            }
+
+    def _unit_value(self, key: str) -> Any:
+        if self.coordinator.data and self.unitnumber in self.coordinator.data:
+            return self.coordinator.data[self.unitnumber].get(key)
+        return self._restored.get(key)
+
     @property
     def battery_level(self) -> int | None:
         """Return battery level value of the device."""
-        return self.coordinator.data.get(self.unitnumber, {}).get("soc") if self.coordinator.data else None
+        return self._unit_value("soc")
 
     @property
     def latitude(self) -> float | None:
         """Return latitude value of the device."""
-        return self.coordinator.data.get(self.unitnumber, {}).get("latitude") if self.coordinator.data else None
+        return self._unit_value("latitude")
 
     @property
     def longitude(self) -> float | None:
         """Return longitude value of the device."""
-        return self.coordinator.data.get(self.unitnumber, {}).get("longitude") if self.coordinator.data else None
+        return self._unit_value("longitude")
 
     @property
     def source_type(self):
@@ -83,7 +107,7 @@ class ZeroTrackerEntity(ZeroEntity, TrackerEntity):
         if not unit:
             return None
 
-        return {
+        attributes = {
             key: value
             for key, value in unit.items()
             if key in {
@@ -97,3 +121,7 @@ class ZeroTrackerEntity(ZeroEntity, TrackerEntity):
                 "datetime_utc"
             }
         }
+        # the same address for every fix within a few hundred meters
+        if (address := self.coordinator.unit_address(self.unitnumber)) is not None:
+            attributes["address"] = address
+        return attributes
@@ -0,0 +1,53 @@
+"""Diagnostics support for zero_motorcycles_integration."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import ZeroCoordinator
+
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+    "name",
+    "latitude",
+    "longitude",
+    "address",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the state of the coordinator with the recent changes of every unit."""
+    coordinator: ZeroCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "last_update_success": coordinator.last_update_success,
+        "update_interval": str(coordinator.update_interval),
+        "budget": coordinator.budget.as_dict(),
+        "latency": coordinator.latency.as_dict(),
+        "fleet": asdict(coordinator.fleet),
+        "units": {
+            # the vin is the unit name, the unit number identifies the unit well enough
+            unitnumber: {
+                "profile": scan_state.profile.name,
+                "shard": scan_state.shard,
+                "rapid_scan": scan_state.enable_rapid_scan or scan_state.rapid_scan_auto_enabled,
+                "deep_idle": scan_state.deep_idle,
+                "motion": scan_state.motion.state,
+                "stale": sorted(scan_state.stale),
+                "data_last_updated_time": scan_state.data_last_updated_time.isoformat(),
+                "data": async_redact_data(data.get(unitnumber, {}), TO_REDACT),
+                "deltas": async_redact_data(scan_state.deltas.as_list(), TO_REDACT),
+            }
+            for unitnumber, scan_state in coordinator.units_scan_state.items()
+        },
+    }
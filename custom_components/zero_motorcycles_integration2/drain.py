@@ -0,0 +1,116 @@
+"""Battery drain tracking for parked units."""
+from __future__ import annotations
+
+from datetime import datetime
+
+from .api import TrackingUnitState, TrackingUnitStateKeys
+
+# Signals that drift slowly while a bike is parked, with the deviation from
+# the fitted trend that is allowed before we consider the unit to be active again.
+DRAIN_SIGNALS: dict[TrackingUnitStateKeys, float] = {
+    "soc": 3.0,
+    "main_voltage": 0.5,
+    "battery": 5.0,
+}
+
+
+class StreamingRegression:
+    """Incremental least squares fit of a value over time (hours)."""
+
+    __slots__ = ("count", "mean_x", "mean_y", "sum_xx", "sum_xy")
+
+    def __init__(self) -> None:
+        """Start without samples."""
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+
+    def add(self, x: float, y: float) -> None:
+        """Add a sample, updating the running means and co-moments."""
+        self.count += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.count
+        self.mean_y += (y - self.mean_y) / self.count
+        self.sum_xx += dx * (x - self.mean_x)
+        self.sum_xy += dx * (y - self.mean_y)
+
+    @property
+    def slope(self) -> float | None:
+        """Change of value per hour, if there is enough data to tell."""
+        if self.count < 2 or self.sum_xx <= 0:
+            return None
+        return self.sum_xy / self.sum_xx
+
+    def predict(self, x: float) -> float | None:
+        """Return the expected value at x according to the fitted line."""
+        if self.count == 0:
+            return None
+        slope = self.slope
+        if slope is None:
+            return self.mean_y
+        return self.mean_y + slope * (x - self.mean_x)
+
+
+class DrainMonitor:
+    """Tracks the slow drain of the batteries on a parked unit."""
+
+    __slots__ = ("origin", "last_sample_key", "regressions")
+
+    def __init__(self) -> None:
+        """Start without samples."""
+        self.origin: datetime | None = None
+        self.last_sample_key: str | None = None
+        self.regressions: dict[str, StreamingRegression] = {}
+
+    def reset(self) -> None:
+        """Forget all samples, used whenever the unit stops being parked."""
+        self.origin = None
+        self.last_sample_key = None
+        self.regressions = {}
+
+    def _hours(self, time: datetime) -> float:
+        if self.origin is None:
+            self.origin = time
+        return (time - self.origin).total_seconds() / 3600
+
+    def drifted(self, state: TrackingUnitState, time: datetime) -> bool:
+        """Check whether any signal deviates from its trend by more than its threshold."""
+        if self.origin is None:
+            return False
+        x = self._hours(time)
+        for key, threshold in DRAIN_SIGNALS.items():
+            regression = self.regressions.get(key)
+            value = _as_float(state.get(key))
+            expected = regression.predict(x) if regression else None
+            if value is not None and expected is not None and abs(value - expected) > threshold:
+                return True
+        return False
+
+    def add_sample(self, state: TrackingUnitState, time: datetime) -> None:
+        """Add the signals of a new transmission to the fitted trends."""
+        # the api keeps returning the last transmission, don't count it twice
+        sample_key = str(state.get("datetime_actual", time))
+        if sample_key == self.last_sample_key:
+            return
+        self.last_sample_key = sample_key
+
+        x = self._hours(time)
+        for key in DRAIN_SIGNALS:
+            value = _as_float(state.get(key))
+            if value is not None:
+                self.regressions.setdefault(key, StreamingRegression()).add(x, value)
+
+    def rate(self, key: TrackingUnitStateKeys) -> float | None:
+        """Return the drain per hour of the given signal, positive while discharging."""
+        regression = self.regressions.get(key)
+        slope = regression.slope if regression else None
+        return -slope if slope is not None else None
+
+
+def _as_float(value) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
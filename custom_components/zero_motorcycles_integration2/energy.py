@@ -0,0 +1,189 @@
+"""Energy charged, estimated from the state of charge gained while charging.
+
+Every transmission adds the gain in state of charge since the previous one,
+times the pack capacity of the model, divided by the charging efficiency. The
+running total of every unit is kept in a Store, with the last state of charge so
+a charge across a restart still counts, and imported at the end of every hour
+it grew in as an external statistic with a sum, so it can be used by the
+energy dashboard.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import re
+from typing import Any, Final
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .api import PROP_VIN, TrackingUnit, TrackingUnitState
+from .const import DOMAIN, LOGGER
+
+# nominal pack capacity per model, matched on the start of the model name
+# without the brand, spaces and slashes, longer names are matched first
+PACK_CAPACITY: Final[dict[str, float]] = {
+    "DSRX": 17.3,
+    "SRF": 17.3,
+    "SRS": 17.3,
+    "DSR": 14.4,
+    "FXE": 7.2,
+    "FXS": 7.2,
+    "SR": 14.4,
+    "FX": 7.2,
+    "DS": 14.4,
+    "S": 14.4,
+}
+DEFAULT_PACK_CAPACITY: Final = 14.4  # kWh
+# share of the energy from the outlet that ends up in the pack
+CHARGING_EFFICIENCY: Final = 0.9
+
+ENERGY_STORAGE_VERSION: Final = 1
+ENERGY_SAVE_DELAY: Final = 60
+
+
+def pack_capacity(unit: TrackingUnit) -> float:
+    """Return the pack capacity in kWh of the model of a unit."""
+    model = re.sub(r"[^A-Z0-9]", "", str(unit.get("vehiclemodel") or "").upper()).removeprefix("ZERO")
+    for prefix, capacity in PACK_CAPACITY.items():
+        if model.startswith(prefix):
+            return capacity
+    return DEFAULT_PACK_CAPACITY
+
+
+def _energy_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, Any]]:
+    return Store(hass, ENERGY_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.energy")
+
+
+async def async_remove_stored_energy(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the energy totals stored for an entry."""
+
+    await _energy_store(hass, entry).async_remove()
+
+
+class _UnitEnergy:
+    """Running total of a unit and what is needed to extend it."""
+
+    __slots__ = ("unit", "total", "soc", "charging", "hour", "imported")
+
+    def __init__(self, unit: TrackingUnit, total: float, soc: float | None, charging: bool) -> None:
+        self.unit = unit
+        self.total = total
+        self.soc = soc
+        self.charging = charging
+        # hour the total was last extended in, and whether it was imported since
+        self.hour: datetime | None = None
+        self.imported = True
+
+
+class EnergyEstimator:
+    """Estimates the energy charged by every unit, one transmission at a time."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Start without any units, the stored totals are loaded by async_load."""
+        self.hass = hass
+        self._store = _energy_store(hass, entry)
+        self._stored: dict[str, dict[str, Any]] = {}
+        self._units: dict[str, _UnitEnergy] = {}
+
+    async def async_load(self) -> None:
+        """Load the totals of the last run."""
+        stored = await self._store.async_load() or {}
+        # earlier runs only stored the total
+        self._stored = {
+            unitnumber: energy if isinstance(energy, dict) else {"total": energy}
+            for unitnumber, energy in stored.items()
+        }
+
+    @callback
+    def async_track_hours(self) -> CALLBACK_TYPE:
+        """Import the totals that grew during an hour once it is over, returns a function to stop."""
+        return async_track_utc_time_change(self.hass, self._async_hour_over, minute=0, second=0)
+
+    @callback
+    def _async_hour_over(self, now: datetime) -> None:
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        for energy in self._units.values():
+            if not energy.imported and energy.hour is not None and energy.hour < hour:
+                self._import(energy)
+
+    def total(self, unitnumber: str) -> float | None:
+        """Return the energy charged by a unit in kWh, None before its state of charge is known."""
+        energy = self._units.get(unitnumber)
+        return round(energy.total, 3) if energy and energy.soc is not None else None
+
+    @callback
+    def add(self, unit: TrackingUnit, unit_state: TrackingUnitState, charging: bool) -> None:
+        """Add the state of charge gained since the previous transmission, if the unit was charging in between."""
+        unitnumber = unit["unitnumber"]
+        try:
+            soc = float(unit_state["soc"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        energy = self._units.get(unitnumber)
+        if energy is None:
+            stored = self._stored.get(unitnumber, {})
+            energy = self._units[unitnumber] = _UnitEnergy(
+                unit,
+                stored.get("total", 0.0),
+                stored.get("soc"),
+                stored.get("charging", False),
+            )
+
+        # charging may have ended between the transmissions
+        if energy.soc is not None and soc > energy.soc and (charging or energy.charging):
+            hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+            if energy.hour is not None and energy.hour != hour and not energy.imported:
+                self._import(energy)
+            energy.total += (soc - energy.soc) / 100 * pack_capacity(unit) / CHARGING_EFFICIENCY
+            energy.hour = hour
+            energy.imported = False
+
+        # saved along with the total, so a charge across a restart still counts
+        if soc != energy.soc or charging != energy.charging:
+            self._store.async_delay_save(self._data_to_save, ENERGY_SAVE_DELAY)
+        energy.soc = soc
+        energy.charging = charging
+
+    @callback
+    def async_flush(self) -> None:
+        """Import the totals not imported yet and save them, the statistic of the hour is replaced if it continues later."""
+        for energy in self._units.values():
+            if not energy.imported:
+                self._import(energy)
+        self._store.async_delay_save(self._data_to_save, 0)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            **self._stored,
+            **{
+                unitnumber: {"total": energy.total, "soc": energy.soc, "charging": energy.charging}
+                for unitnumber, energy in self._units.items()
+            },
+        }
+
+    def _import(self, energy: _UnitEnergy) -> None:
+        energy.imported = True
+        if "recorder" not in self.hass.config.components or energy.hour is None:
+            return
+
+        statistic_id = f"{DOMAIN}:{slugify(energy.unit[PROP_VIN])}_energy_charged"
+        LOGGER.debug("importing %s total of %s", statistic_id, energy.hour)
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{energy.unit['unitnumber']} energy charged",
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            ),
+            [StatisticData(start=energy.hour, state=energy.total, sum=energy.total)],
+        )
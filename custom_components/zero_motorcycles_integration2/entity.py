@@ -1,10 +1,14 @@
 """ZeroEntity class."""
 from __future__ import annotations
 
-from homeassistant.helpers.entity import DeviceInfo
+from collections.abc import Callable, Iterable
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import PROP_VIN, TrackingUnit, TrackingUnitState
+from .api import PROP_VIN, TrackingUnit
 from .const import BRAND, BRAND_ATTRIBUTION, DOMAIN
 from .coordinator import ZeroCoordinator
 
@@ -16,29 +20,83 @@ class ZeroEntity(CoordinatorEntity[ZeroCoordinator]):
 
     unit: TrackingUnit
     unitnumber: str
+    # field group the entity shows, the entity is unavailable while it is stale
+    field_group: str | None = None
 
     def __init__(self, coordinator: ZeroCoordinator, unit: TrackingUnit) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+        """Initialize, listening with the unit number as context so only updates of the unit are written."""
+        super().__init__(coordinator, context=unit["unitnumber"])
 
         self.unit = unit
         # set unit number for unit reference here, this is used as a key in received data
         self.unitnumber = unit["unitnumber"]
         self.vin = unit[PROP_VIN]
 
-        data: TrackingUnitState | None = (
-            coordinator.data[self.unitnumber]
-            if self.unitnumber and coordinator.data
-            else None
-        )
+        # shared by all entities of the unit
+        self._attr_device_info = coordinator.device_info(unit)
+
+    @property
+    def available(self) -> bool:
+        """Return if the last update succeeded and the data shown isn't stale."""
+        return super().available and not (self.field_group and self.coordinator.is_stale(self.unitnumber, self.field_group))
 
-        softwareVersion = data.get("software_version", None) if data else None
-        softwareVersion = str(softwareVersion) if softwareVersion else None
 
+class ZeroAccountEntity(CoordinatorEntity[ZeroCoordinator]):
+    """Entity about the account as a whole rather than a single unit."""
+
+    _attr_attribution = BRAND_ATTRIBUTION
+
+    def __init__(self, coordinator: ZeroCoordinator) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+
+        self.entry_id = coordinator.configEntry.entry_id
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self.vin)},
-            name=self.unitnumber,
-            model=self.unit.get("vehiclemodel", None),
+            identifiers={(DOMAIN, self.entry_id)},
+            name=coordinator.configEntry.title,
             manufacturer=BRAND,
-            sw_version=softwareVersion
+            entry_type=DeviceEntryType.SERVICE,
         )
+
+
+@callback
+def async_add_unit_entities(
+    coordinator: ZeroCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    unit_entities: Callable[[TrackingUnit], Iterable[tuple[str, Callable[[], ZeroEntity]]]],
+) -> None:
+    """Add the entities of all current units, and those of units added to the account or fields reported later on.
+
+    unit_entities gives the unique id and a factory of every entity a unit should have,
+    only entities with a unique id that wasn't added yet are created.
+    """
+
+    # unique ids of the entities added per unit
+    added_entities: dict[str, set[str]] = {}
+
+    @callback
+    def async_add_new_entities(units: list[TrackingUnit] | None) -> None:
+        if units is None:
+            units = list(coordinator.units)
+            unitnumbers = {unit["unitnumber"] for unit in units}
+            # forget removed units so their entities are created again if they come back
+            for unitnumber in added_entities.keys() - unitnumbers:
+                del added_entities[unitnumber]
+
+        new_entities = []
+        for unit in units:
+            wanted = dict(unit_entities(unit))
+            added = added_entities.setdefault(unit["unitnumber"], set())
+            # entities of unsupported fields are created again if their field shows up
+            added.intersection_update(wanted)
+            new_entities.extend(create() for unique_id, create in wanted.items() if unique_id not in added)
+            added.update(wanted)
+
+        # entities restore their last state, data is fetched without holding up the platform setup
+        if new_entities:
+            async_add_entities(new_entities)
+
+    async_add_new_entities(None)
+    coordinator.configEntry.async_on_unload(
+        coordinator.async_add_units_listener(async_add_new_entities)
+    )
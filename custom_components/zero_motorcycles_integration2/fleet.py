@@ -0,0 +1,76 @@
+"""Fleet wide aggregates over the data of all units."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from itertools import compress, filterfalse
+from math import isnan, nan
+from typing import TYPE_CHECKING, Final
+
+from .api import TrackingUnitState
+
+if TYPE_CHECKING:
+    from .coordinator import UnitScanState
+
+# accessory batteries below this are reported as low
+LOW_ACCESSORY_VOLTAGE: Final = 11.8  # volts
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value) if value is not None else nan
+    except (TypeError, ValueError):
+        return nan
+
+
+class FleetColumns:
+    """Data of all units as columns, one array per key with the same unit at the same index."""
+
+    __slots__ = ("unitnumbers", "soc", "mileage", "main_voltage", "riding", "charging")
+
+    def __init__(self, data: Mapping[str, TrackingUnitState], scan_states: Mapping[str, UnitScanState]) -> None:
+        """Build the columns, missing and invalid values are nan."""
+        states = [(unitnumber, unit_state) for unitnumber, unit_state in data.items() if unitnumber in scan_states]
+        self.unitnumbers = [unitnumber for unitnumber, _ in states]
+        self.soc = array("d", [_as_float(unit_state.get("soc")) for _, unit_state in states])
+        self.mileage = array("d", [_as_float(unit_state.get("mileage")) for _, unit_state in states])
+        self.main_voltage = array("d", [_as_float(unit_state.get("main_voltage")) for _, unit_state in states])
+        # already parsed by the coordinator when the unit was fetched
+        self.riding = array("b", [scan_states[unitnumber].riding for unitnumber in self.unitnumbers])
+        self.charging = array("b", [scan_states[unitnumber].charging for unitnumber in self.unitnumbers])
+
+
+@dataclass(frozen=True)
+class FleetSummary:
+    """Aggregates of the last refresh, None when no unit reported the value."""
+
+    units: int = 0
+    average_soc: float | None = None
+    minimum_soc: float | None = None
+    riding: int = 0
+    charging: int = 0
+    total_mileage: float | None = None
+    low_accessory_voltage: tuple[str, ...] = ()
+
+    @classmethod
+    def from_columns(cls, columns: FleetColumns) -> FleetSummary:
+        """Reduce every column in one pass over its array."""
+        soc = array("d", filterfalse(isnan, columns.soc))
+        mileage = array("d", filterfalse(isnan, columns.mileage))
+        # nan compares false, so units without a voltage are never low
+        low_voltage = map(LOW_ACCESSORY_VOLTAGE.__gt__, columns.main_voltage)
+        return cls(
+            units=len(columns.unitnumbers),
+            average_soc=sum(soc) / len(soc) if soc else None,
+            minimum_soc=min(soc) if soc else None,
+            riding=sum(columns.riding),
+            charging=sum(columns.charging),
+            total_mileage=sum(mileage) if mileage else None,
+            low_accessory_voltage=tuple(compress(columns.unitnumbers, low_voltage)),
+        )
+
+
+def summarize_fleet(data: Mapping[str, TrackingUnitState], scan_states: Mapping[str, UnitScanState]) -> FleetSummary:
+    """Build the columns of the fleet once and aggregate them."""
+    return FleetSummary.from_columns(FleetColumns(data, scan_states))
@@ -0,0 +1,84 @@
+"""Age of the fields of a unit, grouped by the timestamp they belong to."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Final
+
+from homeassistant.util import dt as dt_util
+
+from .api import TrackingUnitState
+
+GROUP_GPS: Final = "gps"
+GROUP_TELEMETRY: Final = "telemetry"
+
+# timestamp field telling when the fields of each group were measured
+GROUP_TIMESTAMPS: Final[dict[str, str]] = {
+    GROUP_GPS: "datetime_utc",
+    GROUP_TELEMETRY: "datetime_actual",
+}
+
+# everything else is telemetry, motion and distances are derived from the gps fix
+GPS_KEYS: Final = frozenset({
+    "latitude",
+    "longitude",
+    "altitude",
+    "velocity",
+    "heading",
+    "satellites",
+    "gps_valid",
+    "gps_connected",
+    "address",
+    "datetime_utc",
+    "motion",
+    "distance_home",
+    "eta_home",
+})
+
+TRANSMIT_TIME_FORMAT: Final = "%Y%m%d%H%M%S"
+
+
+def field_group(key: str) -> str:
+    """Return the group of a field or derived sensor."""
+    return GROUP_GPS if key in GPS_KEYS else GROUP_TELEMETRY
+
+
+def parse_transmit_time(value) -> datetime | None:
+    """Parse a timestamp field of the api, they are in UTC."""
+    try:
+        return datetime.strptime(str(value), TRANSMIT_TIME_FORMAT).replace(tzinfo=dt_util.UTC)
+    except ValueError:
+        return None
+
+
+def is_newer(unit_state: TrackingUnitState, held: TrackingUnitState | None) -> bool:
+    """Check if the timestamp of any field group advanced past the payload held.
+
+    Payloads without timestamps to compare with the held ones are taken as newer.
+    """
+    if not held:
+        return True
+    compared = False
+    for key in GROUP_TIMESTAMPS.values():
+        received = parse_transmit_time(unit_state.get(key))
+        previous = parse_transmit_time(held.get(key))
+        if received is None or previous is None:
+            continue
+        if received > previous:
+            return True
+        compared = True
+    return not compared
+
+
+def stale_groups(unit_state: TrackingUnitState | None, now: datetime, stale_after: Mapping[str, timedelta]) -> frozenset[str]:
+    """Return the groups older than their threshold, a zero threshold never goes stale."""
+    if not unit_state:
+        return frozenset()
+    stale: set[str] = set()
+    for group, threshold in stale_after.items():
+        if not threshold:
+            continue
+        measured = parse_transmit_time(unit_state.get(GROUP_TIMESTAMPS[group]))
+        if measured is not None and now - measured > threshold:
+            stale.add(group)
+    return frozenset(stale)
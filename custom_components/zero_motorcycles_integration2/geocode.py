@@ -0,0 +1,96 @@
+"""Cache of addresses keyed on a geohash of the position."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Final
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+
+GEOHASH_ALPHABET: Final = "0123456789bcdefghjkmnpqrstuvwxyz"
+# cells of about 150 by 150 meters, positions within a cell share an address
+ADDRESS_PRECISION: Final = 7
+ADDRESS_CACHE_SIZE: Final = 1024
+
+ADDRESS_STORAGE_VERSION: Final = 1
+ADDRESS_SAVE_DELAY: Final = 60
+
+
+def geohash(latitude: float, longitude: float, precision: int = ADDRESS_PRECISION) -> str:
+    """Encode a position as a geohash of the given number of characters."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars: list[str] = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, value_range = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def _address_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, str]]:
+    return Store(hass, ADDRESS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.addresses")
+
+
+async def async_remove_stored_addresses(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the addresses stored for an entry."""
+
+    await _address_store(hass, entry).async_remove()
+
+
+class AddressCache:
+    """Least recently used addresses per geohash cell, persisted between restarts.
+
+    Addresses come from the api, which is always preferred when it gives one. A
+    position the api gives no address for gets the last address of its cell.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Start empty, the stored addresses are loaded by async_load."""
+        self.hass = hass
+        self._store = _address_store(hass, entry)
+        self._addresses: OrderedDict[str, str] = OrderedDict()
+
+    async def async_load(self) -> None:
+        """Load the addresses stored by the last run."""
+        if stored := await self._store.async_load():
+            self._addresses.update(stored)
+            LOGGER.debug("loaded %d cached addresses", len(self._addresses))
+
+    @callback
+    def address(self, latitude: float, longitude: float, api_address: str | None = None) -> str | None:
+        """Return the api address, caching it for its cell, or the cached address of the cell without one."""
+        key = geohash(latitude, longitude)
+        if api_address:
+            if self._addresses.get(key) != api_address:
+                self._add(key, api_address)
+            else:
+                self._addresses.move_to_end(key)
+            return api_address
+        if (address := self._addresses.get(key)) is not None:
+            self._addresses.move_to_end(key)
+        return address
+
+    def _add(self, key: str, address: str) -> None:
+        self._addresses[key] = address
+        self._addresses.move_to_end(key)
+        while len(self._addresses) > ADDRESS_CACHE_SIZE:
+            self._addresses.popitem(last=False)
+        self._store.async_delay_save(lambda: dict(self._addresses), ADDRESS_SAVE_DELAY)
@@ -0,0 +1,191 @@
+"""Long-term statistics for fields that change on every poll.
+
+With the statistics only option these fields no longer get recorded as entity
+states, instead their hourly mean, min and max are imported as external
+statistics. Imported statistics have to start on the hour, shorter periods
+aren't accepted by the recorder. The buckets of the current hour are kept in a
+Store, so an hour continued after a restart or reload adds to what was there.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from math import atan2, cos, degrees, radians, sin
+from typing import Any, Final
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import DEGREE, Platform, UnitOfLength, UnitOfSpeed
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .api import PROP_VIN, TrackingUnit, TrackingUnitState, TrackingUnitStateKeys
+from .const import DOMAIN, LOGGER
+
+# fields with their unit of measurement
+HIGH_CHURN_KEYS: Final[dict[TrackingUnitStateKeys, str | None]] = {
+    "velocity": UnitOfSpeed.KILOMETERS_PER_HOUR,
+    "heading": DEGREE,
+    "altitude": UnitOfLength.METERS,
+    "satellites": None,
+}
+
+# angles are averaged on the circle, the mean of 350 and 10 degrees is 0
+CIRCULAR_KEYS: Final[frozenset[str]] = frozenset({"heading"})
+
+STATISTICS_STORAGE_VERSION: Final = 1
+STATISTICS_SAVE_DELAY: Final = 60
+
+
+def _statistics_store(hass: HomeAssistant, entry: ConfigEntry) -> Store[dict[str, Any]]:
+    return Store(hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.statistics")
+
+
+async def async_remove_stored_statistics(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the open statistics buckets stored for an entry."""
+
+    await _statistics_store(hass, entry).async_remove()
+
+
+class _Bucket:
+    """Aggregate of the values of one field during one hour."""
+
+    __slots__ = ("start", "count", "total", "minimum", "maximum", "sin", "cos")
+
+    def __init__(self, start: datetime) -> None:
+        self.start = start
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self.sin = 0.0
+        self.cos = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.sin += sin(radians(value))
+        self.cos += cos(radians(value))
+
+    def mean(self, circular: bool) -> float:
+        if circular:
+            return degrees(atan2(self.sin, self.cos)) % 360
+        return self.total / self.count
+
+    def as_list(self) -> list[Any]:
+        return [self.start.isoformat(), self.count, self.total, self.minimum, self.maximum, self.sin, self.cos]
+
+    @classmethod
+    def from_list(cls, stored: list[Any]) -> _Bucket | None:
+        start = dt_util.parse_datetime(stored[0])
+        if start is None:
+            return None
+        bucket = cls(start)
+        bucket.count, bucket.total, bucket.minimum, bucket.maximum, bucket.sin, bucket.cos = stored[1:]
+        return bucket
+
+
+class HighChurnStatistics:
+    """Aggregates high churn fields per unit and imports them every hour."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Start without any data, the open buckets of the last run are loaded by async_load."""
+        self.hass = hass
+        self._store = _statistics_store(hass, entry)
+        self._units: dict[str, TrackingUnit] = {}
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+        self._last_fix: dict[str, str] = {}
+
+    async def async_load(self) -> None:
+        """Load the buckets the last run left open, they are imported again once their hour is over."""
+        if not (stored := await self._store.async_load()):
+            return
+        self._units = stored["units"]
+        for unitnumber, key, *stored_bucket in stored["buckets"]:
+            if unitnumber in self._units and key in HIGH_CHURN_KEYS and (bucket := _Bucket.from_list(stored_bucket)):
+                self._buckets[(unitnumber, key)] = bucket
+
+    @callback
+    def add(self, unit: TrackingUnit, unit_state: TrackingUnitState) -> None:
+        """Add the fields of a transmission, repeated transmissions are ignored."""
+        unitnumber = unit["unitnumber"]
+        fix_key = str(unit_state.get("datetime_utc"))
+        if self._last_fix.get(unitnumber) == fix_key:
+            return
+        self._last_fix[unitnumber] = fix_key
+        self._units[unitnumber] = unit
+
+        hour = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        for key in HIGH_CHURN_KEYS:
+            try:
+                value = float(unit_state[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            bucket = self._buckets.get((unitnumber, key))
+            if bucket is not None and bucket.start != hour:
+                self._import(unit, key, bucket)
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[(unitnumber, key)] = _Bucket(hour)
+            bucket.add(value)
+        self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Import the statistics of the current hour so far and save the buckets, a later import of the hour includes them."""
+        for (unitnumber, key), bucket in self._buckets.items():
+            self._import(self._units[unitnumber], key, bucket)
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "units": {unitnumber: dict(unit) for unitnumber, unit in self._units.items()},
+            "buckets": [
+                [unitnumber, key, *bucket.as_list()]
+                for (unitnumber, key), bucket in self._buckets.items()
+            ],
+        }
+
+    def _import(self, unit: TrackingUnit, key: str, bucket: _Bucket) -> None:
+        if "recorder" not in self.hass.config.components or not bucket.count:
+            return
+
+        statistic_id = f"{DOMAIN}:{slugify(unit[PROP_VIN])}_{key}"
+        LOGGER.debug("importing %s statistics of %s from %d values", statistic_id, bucket.start, bucket.count)
+        async_add_external_statistics(
+            self.hass,
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{unit['unitnumber']} {key.replace('_', ' ')}",
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=HIGH_CHURN_KEYS[key],
+            ),
+            [
+                StatisticData(
+                    start=bucket.start,
+                    mean=bucket.mean(key in CIRCULAR_KEYS),
+                    min=bucket.minimum,
+                    max=bucket.maximum,
+                )
+            ],
+        )
+
+
+@callback
+def async_apply_statistics_only(hass: HomeAssistant, entry: ConfigEntry, statistics_only: bool) -> None:
+    """Disable the sensors of high churn fields while only their statistics are kept, enable them again otherwise."""
+    registry = er.async_get(hass)
+    suffixes = tuple(f"-{key}" for key in HIGH_CHURN_KEYS)
+    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity_entry.domain != Platform.SENSOR or not entity_entry.unique_id.endswith(suffixes):
+            continue
+        if statistics_only and entity_entry.disabled_by is None:
+            registry.async_update_entity(entity_entry.entity_id, disabled_by=er.RegistryEntryDisabler.INTEGRATION)
+        elif not statistics_only and entity_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION:
+            registry.async_update_entity(entity_entry.entity_id, disabled_by=None)
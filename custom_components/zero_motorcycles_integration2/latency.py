@@ -0,0 +1,57 @@
+"""Request latency of the api, used to time out fetches and to bound every refresh."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Final
+
+from .api import REQUEST_TIMEOUT
+
+# latencies kept for the percentiles
+LATENCY_SAMPLES: Final = 100
+# latencies needed before the timeout adapts, until then REQUEST_TIMEOUT is used
+MIN_LATENCY_SAMPLES: Final = 10
+# requests time out at this multiple of the 95th percentile latency
+TIMEOUT_FACTOR: Final = 3.0
+MIN_REQUEST_TIMEOUT: Final = 2.0  # seconds
+
+# share of the update interval a refresh may take, the rest is left for processing
+CYCLE_BUDGET_SHARE: Final = 0.8
+
+
+def percentile(samples: list[float], share: float) -> float:
+    """Return the nearest rank percentile of sorted samples."""
+    return samples[min(int(len(samples) * share), len(samples) - 1)]
+
+
+class LatencyTracker:
+    """Latencies of the last requests, a timed out request counts with its timeout."""
+
+    __slots__ = ("cut", "_samples")
+
+    def __init__(self) -> None:
+        """Start without any requests made."""
+        # number of fetches cancelled at the deadline or timed out during the last update
+        self.cut = 0
+        self._samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def add(self, latency: float) -> None:
+        """Record the latency of a request in seconds."""
+        self._samples.append(latency)
+
+    def timeout(self) -> float:
+        """Return the timeout for the next requests, a multiple of the 95th percentile latency."""
+        if len(self._samples) < MIN_LATENCY_SAMPLES:
+            return REQUEST_TIMEOUT
+        samples = sorted(self._samples)
+        return max(MIN_REQUEST_TIMEOUT, min(REQUEST_TIMEOUT, percentile(samples, 0.95) * TIMEOUT_FACTOR))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the observed latencies, used for diagnostics."""
+        samples = sorted(self._samples)
+        return {
+            "samples": len(samples),
+            "p50": round(percentile(samples, 0.5), 3) if samples else None,
+            "p95": round(percentile(samples, 0.95), 3) if samples else None,
+            "timeout": round(self.timeout(), 3),
+            "cut": self.cut,
+        }
@@ -0,0 +1,56 @@
+"""Logging for the hot paths, deduplicated and rate limited so large fleets don't flood the log."""
+from __future__ import annotations
+
+from logging import DEBUG
+from time import monotonic
+from typing import Any, Final
+
+from .const import LOGGER
+
+# the same warning is repeated at most this often
+WARNING_INTERVAL: Final = 3600.0  # seconds
+# one in this many sampled debug messages is logged
+DEBUG_SAMPLE_RATE: Final = 20
+
+
+class UnitLog:
+    """Warnings per (unit, key) and sampled debug traces, messages are only formatted when they are emitted."""
+
+    __slots__ = ("_absent", "_warned", "_samples")
+
+    def __init__(self) -> None:
+        """Start without anything logged."""
+        # fields a unit doesn't report, each is warned about once
+        self._absent: dict[str, set[str]] = {}
+        self._warned: dict[tuple[str, str], float] = {}
+        self._samples: dict[str, int] = {}
+
+    def missing_field(self, unitnumber: str, key: str) -> None:
+        """Record a field missing from the data of a unit, only the first time is logged."""
+        absent = self._absent.setdefault(unitnumber, set())
+        if key not in absent:
+            absent.add(key)
+            LOGGER.warning("%s doesn't report %s, its entity stays unknown", unitnumber, key)
+
+    def warning(self, subject: str, key: str, msg: str, *args: Any) -> None:
+        """Log a warning unless the same one was logged for the subject, a unit or the entry, during the last hour."""
+        now = monotonic()
+        last = self._warned.get((subject, key))
+        if last is None or now - last >= WARNING_INTERVAL:
+            self._warned[(subject, key)] = now
+            LOGGER.warning(msg, *args)
+
+    def sampled_debug(self, key: str, msg: str, *args: Any) -> None:
+        """Log one in every DEBUG_SAMPLE_RATE debug messages with the same key."""
+        if not LOGGER.isEnabledFor(DEBUG):
+            return
+        count = self._samples.get(key, 0)
+        self._samples[key] = count + 1
+        if count % DEBUG_SAMPLE_RATE == 0:
+            LOGGER.debug(msg + " (1 in %d sampled)", *args, DEBUG_SAMPLE_RATE)
+
+    def forget(self, unitnumber: str) -> None:
+        """Drop what was recorded for a removed unit."""
+        self._absent.pop(unitnumber, None)
+        for warned in [warned for warned in self._warned if warned[0] == unitnumber]:
+            del self._warned[warned]
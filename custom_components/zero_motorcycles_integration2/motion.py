@@ -0,0 +1,145 @@
+"""Motion of a unit derived from successive GPS fixes."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from math import asin, cos, radians, sin, sqrt
+from typing import Final
+
+from .api import TrackingUnitState
+
+MOTION_MOVING: Final = "moving"
+MOTION_PARKED: Final = "parked"
+# None until the fixes tell, which Home Assistant shows as unknown
+MOTION_STATES: Final = [MOTION_MOVING, MOTION_PARKED]
+
+EARTH_RADIUS: Final = 6371008.8  # meters
+
+# fixes closer than this to where the unit stopped are considered GPS jitter
+JITTER_RADIUS: Final = 50.0  # meters
+# reported velocity above which the unit is moving regardless of its position
+MOVING_VELOCITY: Final = 5.0  # km/h
+# stationary fixes in a row before a unit is considered parked
+PARKED_AFTER_FIXES: Final = 2
+# weight of the newest fix in the average speed
+SPEED_SMOOTHING: Final = 0.5
+# don't estimate arrival times from speeds below this
+MIN_ETA_SPEED: Final = 1.0  # m/s
+
+
+def haversine(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    """Return the great circle distance in meters between two positions."""
+    dlat = radians(latitude2 - latitude1)
+    dlon = radians(longitude2 - longitude1)
+    a = sin(dlat / 2) ** 2 + cos(radians(latitude1)) * cos(radians(latitude2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(sqrt(a))
+
+
+def _as_float(value) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class MotionTracker:
+    """Streaming state machine over the fixes of a unit, every fix is handled in constant time."""
+
+    __slots__ = (
+        "state",
+        "latitude",
+        "longitude",
+        "fix_time",
+        "fix_key",
+        "received",
+        "anchor",
+        "stationary_fixes",
+        "speed",
+        "distance_home",
+    )
+
+    def __init__(self) -> None:
+        """Start without any fixes."""
+        self.state: str | None = None
+        self.latitude: float | None = None
+        self.longitude: float | None = None
+        self.fix_time: float | None = None
+        self.fix_key: str | None = None
+        # when the last new fix came in
+        self.received: datetime | None = None
+        # position the unit stopped at
+        self.anchor: tuple[float, float] | None = None
+        self.stationary_fixes = 0
+        self.speed = 0.0  # m/s
+        self.distance_home: float | None = None  # meters
+
+    @property
+    def moving(self) -> bool:
+        """Return whether the unit is moving according to its last fixes."""
+        return self.state == MOTION_MOVING
+
+    @property
+    def eta_home(self) -> float | None:
+        """Return the estimated minutes to get home at the current speed while moving."""
+        if not self.moving or self.distance_home is None or self.speed < MIN_ETA_SPEED:
+            return None
+        return self.distance_home / self.speed / 60
+
+    def update(
+        self,
+        unit_state: TrackingUnitState,
+        fix_time: datetime,
+        home: tuple[float, float] | None,
+        received: datetime,
+    ) -> None:
+        """Handle the fix in a new transmission, repeated fixes are ignored."""
+        latitude = _as_float(unit_state.get("latitude"))
+        longitude = _as_float(unit_state.get("longitude"))
+        fix_key = str(unit_state.get("datetime_utc", fix_time))
+        if latitude is None or longitude is None or fix_key == self.fix_key:
+            return
+        self.fix_key = fix_key
+        self.received = received
+
+        timestamp = fix_time.timestamp()
+        velocity = _as_float(unit_state.get("velocity")) or 0.0
+
+        if self.latitude is not None and self.longitude is not None and self.fix_time is not None:
+            distance = haversine(self.latitude, self.longitude, latitude, longitude)
+            elapsed = timestamp - self.fix_time
+            from_anchor = haversine(*self.anchor, latitude, longitude) if self.anchor else distance
+
+            if from_anchor > JITTER_RADIUS or velocity > MOVING_VELOCITY:
+                fix_speed = max(velocity / 3.6, distance / elapsed if elapsed > 0 else 0.0)
+                self.speed = fix_speed if not self.moving else SPEED_SMOOTHING * fix_speed + (1 - SPEED_SMOOTHING) * self.speed
+                self.state = MOTION_MOVING
+                self.anchor = None
+                self.stationary_fixes = 0
+            else:
+                if self.anchor is None:
+                    self.anchor = (self.latitude, self.longitude)
+                self.stationary_fixes += 1
+                self.speed = 0.0
+                if self.stationary_fixes >= PARKED_AFTER_FIXES:
+                    self.state = MOTION_PARKED
+
+        self.latitude = latitude
+        self.longitude = longitude
+        self.fix_time = timestamp
+        self.distance_home = haversine(latitude, longitude, *home) if home else None
+
+    def settle(self, time_now: datetime, standing: bool, quiet_after: timedelta) -> bool:
+        """Park a moving unit that stands still or sent no new fix for quiet_after, return True when it was parked.
+
+        The last fix of a ride may be far from the one before, without this the unit
+        would stay moving for as long as the api repeats it.
+        """
+        if not self.moving:
+            return False
+        if not standing and (self.received is None or time_now - self.received < quiet_after):
+            return False
+
+        self.state = MOTION_PARKED
+        self.speed = 0.0
+        self.anchor = (self.latitude, self.longitude) if self.latitude is not None and self.longitude is not None else None
+        self.stationary_fixes = PARKED_AFTER_FIXES
+        return True
@@ -0,0 +1,38 @@
+"""Span timing for the stages of a refresh."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any
+
+
+class RefreshProfiler:
+    """Accumulates the time spent in each stage of the refresh pipeline."""
+
+    __slots__ = ("spans",)
+
+    def __init__(self) -> None:
+        """Start without any timings."""
+        self.spans: dict[str, list[float]] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one occurrence of the named stage."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.setdefault(name, []).append(perf_counter() - start)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Return count, total, mean and max seconds per stage."""
+        return {
+            name: {
+                "count": len(durations),
+                "total": round(sum(durations), 6),
+                "mean": round(sum(durations) / len(durations), 6),
+                "max": round(max(durations), 6),
+            }
+            for name, durations in self.spans.items()
+        }
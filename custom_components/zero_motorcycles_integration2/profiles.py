@@ -0,0 +1,68 @@
+"""Scan profiles that can be assigned to individual units."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Final
+
+from .api import TrackingUnitStateKeys
+
+PROFILE_DEFAULT: Final = "default"
+PROFILE_COMMUTER: Final = "commuter"
+PROFILE_STORED: Final = "stored"
+PROFILE_FLEET_PRIORITY: Final = "fleet_priority"
+
+
+@dataclass(frozen=True)
+class ScanProfile:
+    """Intervals and rapid scan triggers of a unit, None intervals use the ones from the options."""
+
+    name: str
+    scan_interval: timedelta | None = None
+    rapid_scan_interval: timedelta | None = None
+    deep_idle_scan_interval: timedelta | None = None
+    # any of these being on switches the unit to rapid scan
+    rapid_scan_triggers: frozenset[TrackingUnitStateKeys] = frozenset({"ignition", "charging"})
+
+
+SCAN_PROFILES: Final[dict[str, ScanProfile]] = {
+    PROFILE_DEFAULT: ScanProfile(PROFILE_DEFAULT),
+    PROFILE_COMMUTER: ScanProfile(
+        PROFILE_COMMUTER,
+        scan_interval=timedelta(minutes=15),
+        rapid_scan_interval=timedelta(seconds=30),
+        deep_idle_scan_interval=timedelta(hours=2),
+    ),
+    PROFILE_STORED: ScanProfile(
+        PROFILE_STORED,
+        scan_interval=timedelta(hours=2),
+        rapid_scan_interval=timedelta(minutes=5),
+        deep_idle_scan_interval=timedelta(hours=24),
+        # stored bikes are often kept on a charger, only riding is interesting
+        rapid_scan_triggers=frozenset({"ignition"}),
+    ),
+    PROFILE_FLEET_PRIORITY: ScanProfile(
+        PROFILE_FLEET_PRIORITY,
+        scan_interval=timedelta(minutes=5),
+        rapid_scan_interval=timedelta(seconds=15),
+        deep_idle_scan_interval=timedelta(minutes=30),
+        rapid_scan_triggers=frozenset({"ignition", "charging", "pluggedin"}),
+    ),
+}
+
+# option holding the units assigned to each profile, when a unit is assigned
+# to more than one profile the first one listed here wins
+CONF_PROFILE_UNITS: Final[dict[str, str]] = {
+    PROFILE_FLEET_PRIORITY: "fleet_priority_units",
+    PROFILE_COMMUTER: "commuter_units",
+    PROFILE_STORED: "stored_units",
+}
+
+
+def unit_profiles(options: dict) -> dict[str, ScanProfile]:
+    """Map unit numbers to the profile they were assigned in the options."""
+    profiles: dict[str, ScanProfile] = {}
+    for profile, option in reversed(CONF_PROFILE_UNITS.items()):
+        for unitnumber in options.get(option, []):
+            profiles[unitnumber] = SCAN_PROFILES[profile]
+    return profiles
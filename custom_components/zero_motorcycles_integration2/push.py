@@ -0,0 +1,93 @@
+"""Webhook accepting pushed unit data, polling stays as the fallback."""
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import Any, Final
+
+from aiohttp import web
+
+from homeassistant.components import persistent_notification, webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.network import NoURLAvailableError
+
+from .api import TrackingUnitState
+from .const import DOMAIN, LOGGER
+from .coordinator import ZeroCoordinator
+from .freshness import parse_transmit_time
+
+# timestamps the processing and the timestamp sensors parse
+TIME_KEYS: Final = ("datetime_utc", "datetime_actual")
+
+
+def validate_unit_state(unit_state: Any) -> TrackingUnitState:
+    """Check a pushed unit state and coerce it to what the api returns, raises ValueError when it can't be used."""
+    if not isinstance(unit_state, dict) or unit_state.get("unitnumber") in (None, ""):
+        raise ValueError("Every unit state needs a unitnumber")
+    if nested := [key for key, value in unit_state.items() if isinstance(value, (dict, list))]:
+        raise ValueError(f"{', '.join(nested)} have to be single values")
+
+    coerced = {**unit_state, "unitnumber": str(unit_state["unitnumber"])}
+    for key in TIME_KEYS:
+        value = coerced.pop(key, None)
+        if value is None or value == "":
+            continue
+        if parse_transmit_time(value) is None:
+            raise ValueError(f"{key} has to be formatted as YYYYMMDDhhmmss")
+        coerced[key] = str(value)
+    return coerced
+
+
+@callback
+def async_setup_push_webhook(hass: HomeAssistant, entry: ConfigEntry, coordinator: ZeroCoordinator) -> None:
+    """Register the webhook of the entry, it is unregistered when the entry unloads.
+
+    The webhook accepts a single object or a list of objects shaped like the
+    get_last_transmit response, units that aren't part of the account are ignored.
+    """
+
+    if not (webhook_id := entry.data.get(CONF_WEBHOOK_ID)):
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id})
+
+    async def async_handle_webhook(hass: HomeAssistant, webhook_id: str, request: web.Request) -> web.Response:
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Payload is not json")
+
+        # checked as a whole, a bad unit state doesn't leave the others half applied
+        try:
+            unit_states = [
+                validate_unit_state(unit_state)
+                for unit_state in (payload if isinstance(payload, list) else [payload])
+            ]
+        except ValueError as exception:
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text=str(exception))
+
+        accepted = coordinator.async_push_unit_states(unit_states)
+        return web.json_response({"accepted": accepted})
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"{entry.title} unit data",
+        webhook_id,
+        async_handle_webhook,
+        allowed_methods=[web.hdrs.METH_POST],
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+
+    try:
+        url = webhook.async_generate_url(hass, webhook_id)
+    except NoURLAvailableError:
+        url = webhook.async_generate_path(webhook_id)
+    # the webhook id is all it takes to push data, it is shown to the user and never logged
+    LOGGER.debug("Accepting pushed unit data for %s", entry.title)
+    persistent_notification.async_create(
+        hass,
+        f"Unit data for {entry.title} can be pushed to `{url}`. Keep this address secret, anyone who has it can push data.",
+        title="Zero Motorcycles push webhook",
+        notification_id=f"{DOMAIN}_{entry.entry_id}_push_webhook",
+    )
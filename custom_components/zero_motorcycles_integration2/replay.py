@@ -0,0 +1,135 @@
+"""Recording and replaying of api responses.
+
+Responses are stored as gzip compressed newline delimited json, one object per
+response with the time it was received, the command, the unit number if any and
+the response itself.
+"""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_right
+import gzip
+import json
+from time import time
+from typing import Any
+
+import aiohttp
+
+from .api import (
+    REQUEST_TIMEOUT,
+    TrackingUnit,
+    TrackingUnitState,
+    ZeroApiClient,
+    ZeroApiClientCommunicationError,
+    ZeroApiClientError,
+)
+from .clock import ReplayClock
+
+COMMAND_GET_UNITS = "get_units"
+COMMAND_GET_LAST_TRANSMIT = "get_last_transmit"
+
+
+class ZeroRecordingApiClient(ZeroApiClient):
+    """Api client that appends every response it receives to a log."""
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        session: aiohttp.ClientSession,
+        path: str,
+    ) -> None:
+        """Set user credentials for API and the log to append to."""
+        super().__init__(username, password, session)
+        self._path = path
+        # keeps the log in the order the responses were received
+        self._lock = asyncio.Lock()
+
+    async def async_get_units(self) -> list[TrackingUnit]:
+        """Get available unit numbers from API and record them."""
+        units = await super().async_get_units()
+        await self._async_record(COMMAND_GET_UNITS, None, units)
+        return units
+
+    async def async_get_last_transmit(self, unitnumber, timeout: float = REQUEST_TIMEOUT) -> TrackingUnitState:
+        """Get available data from API and record it."""
+        unit_state = await super().async_get_last_transmit(unitnumber, timeout)
+        await self._async_record(COMMAND_GET_LAST_TRANSMIT, unitnumber, unit_state)
+        return unit_state
+
+    async def _async_record(self, command: str, unitnumber: str | None, response: Any) -> None:
+        line = json.dumps(
+            {
+                "time": time(),
+                "command": command,
+                "unitnumber": unitnumber,
+                "response": response,
+            },
+            default=str,
+        )
+        async with self._lock:
+            await asyncio.get_running_loop().run_in_executor(None, self._append, line)
+
+    def _append(self, line: str) -> None:
+        # every append adds a gzip member, readers handle those as one stream
+        with gzip.open(self._path, "at", encoding="utf-8") as log:
+            log.write(line + "\n")
+
+
+class ZeroReplayApiClient(ZeroApiClient):
+    """Api client that serves recorded responses instead of calling the API.
+
+    Recorded time starts at the first response in the log when the first request
+    is made, and moves forward with the replay clock, `speed` times as fast as real
+    time. Every request
+    gets the last response recorded at or before the current recorded time.
+    """
+
+    def __init__(self, path: str, clock: ReplayClock) -> None:
+        """Set the log to replay and the clock to move through it with."""
+        super().__init__("", "", None)
+        self._path = path
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._responses: dict[tuple[str, str | None], tuple[list[float], list[Any]]] | None = None
+        self._recorded_start = 0.0
+
+    async def async_get_units(self) -> list[TrackingUnit]:
+        """Get the recorded units."""
+        return [dict(unit) for unit in await self._async_replay(COMMAND_GET_UNITS, None)]
+
+    async def async_get_last_transmit(self, unitnumber, timeout: float = REQUEST_TIMEOUT) -> TrackingUnitState:
+        """Get the recorded data of a unit, replayed responses never time out."""
+        return dict(await self._async_replay(COMMAND_GET_LAST_TRANSMIT, unitnumber))
+
+    async def _async_replay(self, command: str, unitnumber: str | None) -> Any:
+        async with self._lock:
+            if self._responses is None:
+                self._responses = await asyncio.get_running_loop().run_in_executor(None, self._load)
+                self._clock.start_recording(self._recorded_start)
+
+        recorded = self._responses.get((command, unitnumber))
+        if not recorded:
+            raise ZeroApiClientCommunicationError(f"No recorded {command} response for {unitnumber}")
+
+        times, responses = recorded
+        recorded_now = self._clock.recorded_time()
+        with self._span("network"):
+            return responses[max(bisect_right(times, recorded_now) - 1, 0)]
+
+    def _load(self) -> dict[tuple[str, str | None], tuple[list[float], list[Any]]]:
+        responses: dict[tuple[str, str | None], tuple[list[float], list[Any]]] = {}
+        try:
+            with gzip.open(self._path, "rt", encoding="utf-8") as log:
+                records = [json.loads(line) for line in log if line.strip()]
+        # a log cut short by an unclean shutdown ends in an EOFError
+        except (EOFError, OSError, ValueError) as exception:
+            raise ZeroApiClientError(f"Unable to read recorded responses from {self._path}") from exception
+
+        records.sort(key=lambda record: record["time"])
+        self._recorded_start = records[0]["time"] if records else 0.0
+        for record in records:
+            times, recorded = responses.setdefault((record["command"], record["unitnumber"]), ([], []))
+            times.append(record["time"])
+            recorded.append(record["response"])
+        return responses
@@ -1,13 +1,16 @@
 """Sensor platform for zero_motorcycles_integration."""
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
 from operator import itemgetter
-from typing import cast
+from typing import Any, cast
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -18,18 +21,23 @@ from homeassistant.const import (
     DEGREE,
     PERCENTAGE,
     UnitOfElectricPotential,
+    UnitOfEnergy,
     UnitOfLength,
     UnitOfSpeed,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
+from homeassistant.helpers.typing import StateType
 from homeassistant.util import dt as dt_util
 
 from .api import TrackingUnit, TrackingUnitStateKeys
-from .const import DOMAIN, LOGGER
-from .coordinator import ZeroCoordinator, parse_state_as_date
-from .entity import ZeroEntity
+from .const import DOMAIN
+from .coordinator import ZeroCoordinator, unit_unique_id
+from .entity import ZeroAccountEntity, ZeroEntity, async_add_unit_entities
+from .freshness import field_group
+from .high_churn import HIGH_CHURN_KEYS
+from .motion import MOTION_STATES
 
 
 @dataclass(frozen=True)
@@ -37,25 +45,45 @@ class ZeroSensorEntityDescription(SensorEntityDescription):
     """"Does what it says on the tin."""
 
     value_fn: Callable = lambda sv: sv
+    data_fn: Callable[[ZeroCoordinator, TrackingUnit], float | int | None] | None = None
     # Mapping of (max value, icon)
-    iconset: list[tuple[float, str]] | None = None
+    iconset: tuple[tuple[float, str], ...] | None = None
+    icon_thresholds: tuple[float, ...] = field(default=(), init=False)
+    icons: tuple[str, ...] = field(default=(), init=False)
 
     def __post_init__(self):
-        """Reverse-sort the icon set by the 'max value' attributes so the correct icon can be found by just searching through."""
+        """Split the icon set, sorted by the 'max value' attributes, into tables that can be bisected."""
         if self.iconset:
-            self.iconset.sort(key=itemgetter(0), reverse=True)
+            iconset = tuple(sorted(self.iconset, key=itemgetter(0)))
+            object.__setattr__(self, "iconset", iconset)
+            object.__setattr__(self, "icon_thresholds", tuple(maxValue for maxValue, _ in iconset))
+            object.__setattr__(self, "icons", tuple(icon for _, icon in iconset))
+
+    def icon_for(self, value: float) -> str | None:
+        """Find the icon of the first 'max value' above the value, values beyond the last one use the last icon."""
+        if not self.icons:
+            return None
+        return self.icons[min(bisect_right(self.icon_thresholds, value), len(self.icons) - 1)]
 
     @property
     def data_key(self) -> TrackingUnitStateKeys:
         """Literalifies."""
         return cast(TrackingUnitStateKeys, self.key)
 
+@dataclass(frozen=True, kw_only=True)
+class ZeroAccountSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor about the whole account."""
+
+    value_fn: Callable[[ZeroCoordinator], StateType]
+    attributes_fn: Callable[[ZeroCoordinator], Mapping[str, Any]] | None = None
+
+
 SENSORS = (
     ZeroSensorEntityDescription(
         key="soc",
         name="State of Charge",
         icon="mdi:battery-50",
-        iconset=[(10, "mdi:battery-10"), (20, "mdi:battery-20"), (30, "mdi:battery-30"),(40, "mdi:battery-40"),(50, "mdi:battery-50"),(60, "mdi:battery-60"),(70, "mdi:battery-70"),(80, "mdi:battery-80"),(90, "mdi:battery-90"),(100, "mdi:battery")],
+        iconset=((10, "mdi:battery-10"), (20, "mdi:battery-20"), (30, "mdi:battery-30"),(40, "mdi:battery-40"),(50, "mdi:battery-50"),(60, "mdi:battery-60"),(70, "mdi:battery-70"),(80, "mdi:battery-80"),(90, "mdi:battery-90"),(100, "mdi:battery")),
         device_class=SensorDeviceClass.BATTERY,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=PERCENTAGE,
@@ -136,6 +164,126 @@ SENSORS = (
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=PERCENTAGE,
     ),
+    ZeroSensorEntityDescription(
+        key="soc_drain_rate",
+        name="Parked drain rate",
+        icon="mdi:battery-arrow-down-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=f"{PERCENTAGE}/{UnitOfTime.HOURS}",
+        suggested_display_precision=2,
+        data_fn=lambda co, unit: co.drain_rate(unit, "soc"),
+    ),
+    ZeroSensorEntityDescription(
+        key="motion",
+        name="Motion",
+        icon="mdi:motorbike",
+        device_class=SensorDeviceClass.ENUM,
+        options=MOTION_STATES,
+        data_fn=lambda co, unit: motion.state if (motion := co.motion(unit)) else None,
+    ),
+    ZeroSensorEntityDescription(
+        key="distance_home",
+        name="Distance from home",
+        icon="mdi:home-map-marker",
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfLength.METERS,
+        suggested_unit_of_measurement=UnitOfLength.KILOMETERS,
+        data_fn=lambda co, unit: motion.distance_home if (motion := co.motion(unit)) else None,
+    ),
+    ZeroSensorEntityDescription(
+        key="eta_home",
+        name="Time to home",
+        icon="mdi:home-clock",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        data_fn=lambda co, unit: motion.eta_home if (motion := co.motion(unit)) else None,
+    ),
+    ZeroSensorEntityDescription(
+        key="energy_charged",
+        name="Energy charged",
+        icon="mdi:battery-charging-high",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=2,
+        data_fn=lambda co, unit: co.energy.total(unit["unitnumber"]),
+    ),
+)
+
+ACCOUNT_SENSORS = (
+    ZeroAccountSensorEntityDescription(
+        key="api_requests_hour",
+        name="API requests last hour",
+        icon="mdi:api",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="requests",
+        value_fn=lambda co: co.budget.used_hour(),
+        attributes_fn=lambda co: co.budget.as_dict(),
+    ),
+    ZeroAccountSensorEntityDescription(
+        key="api_requests_day",
+        name="API requests last day",
+        icon="mdi:api",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="requests",
+        value_fn=lambda co: co.budget.used_day(),
+    ),
+    ZeroAccountSensorEntityDescription(
+        key="fleet_average_soc",
+        name="Fleet average state of charge",
+        icon="mdi:battery-50",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        value_fn=lambda co: co.fleet.average_soc,
+        attributes_fn=lambda co: {"units": co.fleet.units},
+    ),
+    ZeroAccountSensorEntityDescription(
+        key="fleet_minimum_soc",
+        name="Fleet lowest state of charge",
+        icon="mdi:battery-10",
+        device_class=SensorDeviceClass.BATTERY,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda co: co.fleet.minimum_soc,
+    ),
+    ZeroAccountSensorEntityDescription(
+        key="fleet_riding",
+        name="Fleet riding",
+        icon="mdi:motorbike-electric",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="bikes",
+        value_fn=lambda co: co.fleet.riding,
+    ),
+    ZeroAccountSensorEntityDescription(
+        key="fleet_charging",
+        name="Fleet charging",
+        icon="mdi:battery-charging",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="bikes",
+        value_fn=lambda co: co.fleet.charging,
+    ),
+    ZeroAccountSensorEntityDescription(
+        key="fleet_total_mileage",
+        name="Fleet total mileage",
+        icon="mdi:gauge",
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.TOTAL,
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        value_fn=lambda co: co.fleet.total_mileage,
+    ),
+    ZeroAccountSensorEntityDescription(
+        key="fleet_low_accessory_voltage",
+        name="Fleet low accessory battery",
+        icon="mdi:car-battery",
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement="bikes",
+        value_fn=lambda co: len(co.fleet.low_accessory_voltage),
+        attributes_fn=lambda co: {"units": list(co.fleet.low_accessory_voltage)},
+    ),
 )
 
 
@@ -146,20 +294,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
 
     async_add_entities(
         [
-            ZeroSensor(
-                coordinator,
-                entity_description,
-                unit=unitInfo
+            ZeroAccountSensor(coordinator, entity_description)
+            for entity_description in ACCOUNT_SENSORS
+        ]
+    )
+
+    async_add_unit_entities(
+        coordinator,
+        async_add_entities,
+        lambda unitInfo: (
+            (
+                unit_unique_id(unitInfo, entity_description.key),
+                partial(ZeroSensor, coordinator, entity_description, unit=unitInfo),
             )
-            for unitInfo in coordinator.units
             for entity_description in SENSORS
-        ],
-        True
+            # derived sensors are always created
+            if entity_description.data_fn or coordinator.supports(unitInfo, entity_description.key)
+        ),
     )
 
-class ZeroSensor(ZeroEntity, SensorEntity):
+class ZeroSensor(ZeroEntity, RestoreSensor):
     """zero_motorcycles_integration Sensor class."""
 
+    entity_description: ZeroSensorEntityDescription
+
+    # changes with every update and is already part of the state history
+    _unrecorded_attributes = frozenset({"timestamp"})
+
+    _raw_value: Any = None
+    # value from before the restart, shown until the first update
+    _restored_value: Any = None
+    # last (raw value, converted value) pair
+    _converted: tuple[Any, Any] | None = None
+
     def __init__(
         self,
         coordinator: ZeroCoordinator,
@@ -171,42 +338,100 @@ class ZeroSensor(ZeroEntity, SensorEntity):
 
         self.entity_description = entity_description
 
-        self._attr_unique_id = f"{self.vin}-{entity_description.key}"
+        self._attr_unique_id = unit_unique_id(unit, entity_description.key)
+
+        # timestamps show their age themselves
+        if entity_description.device_class != SensorDeviceClass.TIMESTAMP:
+            self.field_group = field_group(entity_description.key)
+
+        if coordinator.statistics_only and entity_description.key in HIGH_CHURN_KEYS:
+            self._attr_entity_registry_enabled_default = False
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last value while the first update runs in the background."""
+        await super().async_added_to_hass()
+
+        if (last_sensor_data := await self.async_get_last_sensor_data()) is not None:
+            # states of older versions may no longer be an option
+            options = self.entity_description.options
+            if options is None or last_sensor_data.native_value in options:
+                self._restored_value = last_sensor_data.native_value
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
-        state = self.coordinator.data.get(self.unitnumber, {}).get(self.entity_description.data_key) if self.coordinator.data else None
-        LOGGER.debug(
-            "Sensor value for %s is %s",
-            self.unique_id,
-            state,
-        )
+        if self.entity_description.data_fn:
+            state = self.entity_description.data_fn(self.coordinator, self.unit)
+        else:
+            state = self.coordinator.data.get(self.unitnumber, {}).get(self.entity_description.data_key) if self.coordinator.data else None
 
-        if state is not None:
-            state = self.entity_description.value_fn(state)
+        # fields some models never report are only logged once
+        if state is None and not self.entity_description.data_fn and self.coordinator.data and self.unitnumber in self.coordinator.data:
+            self.coordinator.log.missing_field(self.unitnumber, self.entity_description.key)
 
-            if isinstance(state, datetime) and state.tzinfo is None:
-                state = state.replace(tzinfo=dt_util.UTC)
-        else:
-            LOGGER.warning(
-                "Invalid sensor value for %s: %s",
-                self.unique_id,
-                state,
-            )
+        # converted when the state is written, see native_value
+        self._raw_value = state
+        self._restored_value = None
 
-        self._attr_native_value = state
+        self._attr_extra_state_attributes = self.coordinator.timestamp_attributes(self.unitnumber)
 
-        datetime_data = self.coordinator.data.get(self.unitnumber, {}).get("datetime_actual") if self.coordinator.data else None
+        super()._handle_coordinator_update()
 
-        self._attr_extra_state_attributes = {
-            "timestamp": parse_state_as_date(datetime_data)
-        }
+    @property
+    def native_value(self) -> Any:
+        """Convert the raw value from the api only when it is read, and only once per value."""
 
-        if isinstance(state, int | float) and self.entity_description.iconset:
-            for (maxValue, icon) in self.entity_description.iconset:
-                if state < maxValue:
-                    self._attr_icon = icon
+        raw_value = self._raw_value
+        if raw_value is None:
+            return self._restored_value
 
-        super()._handle_coordinator_update()
+        if self._converted is None or self._converted[0] != raw_value:
+            value = self.entity_description.value_fn(raw_value)
+            if isinstance(value, datetime) and value.tzinfo is None:
+                value = value.replace(tzinfo=dt_util.UTC)
+            self._converted = (raw_value, value)
+
+        return self._converted[1]
+
+    @property
+    def icon(self) -> str | None:
+        """Look up the icon for the current value in the icon set, if there is one."""
+
+        if self.entity_description.icons:
+            value = self.native_value
+            if isinstance(value, int | float):
+                return self.entity_description.icon_for(value)
+        return super().icon
+
+
+class ZeroAccountSensor(ZeroAccountEntity, SensorEntity):
+    """Sensor about the whole account."""
+
+    entity_description: ZeroAccountSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: ZeroCoordinator,
+        entity_description: ZeroAccountSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator)
+
+        self.entity_description = entity_description
+
+        self._attr_unique_id = f"{self.entry_id}-{entity_description.key}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value of the sensor."""
+
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes of the sensor."""
+
+        if self.entity_description.attributes_fn:
+            return self.entity_description.attributes_fn(self.coordinator)
+        return None
@@ -0,0 +1,129 @@
+"""Services for zero_motorcycles_integration."""
+from __future__ import annotations
+
+import cProfile
+import pstats
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+from .coordinator import ZeroCoordinator
+from .profiler import RefreshProfiler
+
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+
+ATTR_CYCLES = "cycles"
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+# number of functions listed in the returned summary, the written report has more
+PROFILE_SUMMARY_TOP = 10
+PROFILE_REPORT_TOP = 50
+
+
+def _get_coordinators(hass: HomeAssistant, entry_id: str | None) -> dict[str, ZeroCoordinator]:
+    coordinators: dict[str, ZeroCoordinator] = hass.data.get(DOMAIN, {})
+    if entry_id is None:
+        return dict(coordinators)
+    if entry_id not in coordinators:
+        raise ServiceValidationError(f"{entry_id} is not a loaded {DOMAIN} entry")
+    return {entry_id: coordinators[entry_id]}
+
+
+def _write_profile(profile: cProfile.Profile, path: str) -> dict[str, Any]:
+    """Dump the raw profile and a readable report, return the hottest functions."""
+    profile.dump_stats(f"{path}.prof")
+    with open(f"{path}.txt", "w", encoding="utf-8") as report:
+        stats = pstats.Stats(profile, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_TOP)
+
+    functions = sorted(
+        (
+            (f"{func}:{line}({name})", calls, total, cumulative)
+            for (func, line, name), (_, calls, total, cumulative, _) in stats.stats.items()
+        ),
+        key=lambda function: function[3],
+        reverse=True,
+    )
+    return {
+        "parse": {
+            function: round(cumulative, 6)
+            for function, _, _, cumulative in functions
+            if "parse_state_as_" in function
+        },
+        "top": [
+            {
+                "function": function,
+                "calls": calls,
+                "total": round(total, 6),
+                "cumulative": round(cumulative, 6),
+            }
+            for function, calls, total, cumulative in functions[:PROFILE_SUMMARY_TOP]
+        ],
+    }
+
+
+async def _async_profile_coordinator(hass: HomeAssistant, entry_id: str, coordinator: ZeroCoordinator, cycles: int) -> dict[str, Any]:
+    """Run refresh cycles with span timing and cProfile enabled.
+
+    cProfile follows the event loop thread, so anything else running on the loop
+    between awaits ends up in the profile too.
+    """
+    profiler = RefreshProfiler()
+    profile = cProfile.Profile()
+    coordinator.set_profiler(profiler)
+    profile.enable()
+    try:
+        for _ in range(cycles):
+            # every cycle should cover the whole fleet, not only the units that happen to be due
+            coordinator.mark_all_units_due()
+            with profiler.span("cycle"):
+                await coordinator.async_refresh()
+    finally:
+        profile.disable()
+        coordinator.set_profiler(None)
+
+    path = hass.config.path(f"{DOMAIN}_profile_{entry_id}_{dt_util.utcnow():%Y%m%d%H%M%S}")
+    functions = await hass.async_add_executor_job(_write_profile, profile, path)
+    LOGGER.info("Wrote refresh profile of %s to %s.prof", entry_id, path)
+
+    return {
+        "cycles": cycles,
+        "profile_file": f"{path}.prof",
+        "report_file": f"{path}.txt",
+        "spans": profiler.summary(),
+        **functions,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+        """Profile a number of refresh cycles for one or all entries."""
+        coordinators = _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        return {
+            entry_id: await _async_profile_coordinator(hass, entry_id, coordinator, call.data[ATTR_CYCLES])
+            for entry_id, coordinator in coordinators.items()
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
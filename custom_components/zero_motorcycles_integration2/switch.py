@@ -2,18 +2,21 @@
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 import logging
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.const import STATE_ON
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import DOMAIN
 from .api import TrackingUnit, TrackingUnitState
-from .coordinator import ZeroCoordinator
-from .entity import ZeroEntity
+from .coordinator import ZeroCoordinator, unit_unique_id
+from .entity import ZeroEntity, async_add_unit_entities
 
 
 PARALLEL_UPDATES = 1
@@ -49,21 +52,20 @@ async def async_setup_entry(
 
     coordinator: ZeroCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    async_add_entities(
-        [
-            ZeroSwitch(
-                coordinator,
-                entity_description,
-                unit=unitInfo
+    async_add_unit_entities(
+        coordinator,
+        async_add_entities,
+        lambda unitInfo: (
+            (
+                unit_unique_id(unitInfo, entity_description.key),
+                partial(ZeroSwitch, coordinator, entity_description, unit=unitInfo),
             )
-            for unitInfo in coordinator.units
             for entity_description in SWITCHES
-        ],
-        True
+        ),
     )
 
 
-class ZeroSwitch(ZeroEntity, SwitchEntity):
+class ZeroSwitch(ZeroEntity, SwitchEntity, RestoreEntity):
     """Representation of a switch."""
 
     unit_state: TrackingUnitState | None = None
@@ -77,7 +79,15 @@ class ZeroSwitch(ZeroEntity, SwitchEntity):
         """Initialize."""
         super().__init__(coordinator, unit)
         self.entity_description = entity_description
-        self._attr_unique_id = f"{self.vin}-{entity_description.key}"
+        self._attr_unique_id = unit_unique_id(unit, entity_description.key)
+
+    async def async_added_to_hass(self) -> None:
+        """Turn the switch back on if it was on before the restart."""
+        await super().async_added_to_hass()
+
+        last_state = await self.async_get_last_state()
+        if self.unit and last_state is not None and last_state.state == STATE_ON:
+            self.entity_description.set_fn(self.coordinator, self.unit, True)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the switch on."""
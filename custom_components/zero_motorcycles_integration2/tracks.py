@@ -0,0 +1,160 @@
+"""Recent fixes of every unit, served as GeoJSON simplified for the zoom level of a map.
+
+Every zoom level keeps its own simplified track, built as fixes come in: a fix
+is only added to a level when it falls in another bucket of BUCKET_PIXELS by
+BUCKET_PIXELS pixels on the map tiles of that zoom level than the last fix of
+that level. Serialized tracks are cached until the next fix and carry an ETag,
+so map cards polling an unchanged track get a 304 without any work.
+"""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+from http import HTTPStatus
+import json
+from math import cos, log, pi, radians, tan
+from time import time
+from typing import TYPE_CHECKING, Any, Final
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .api import TrackingUnitState
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import ZeroCoordinator
+
+# fixes kept per unit
+TRACK_LENGTH: Final = 2000
+# zoom levels with a simplified track, requests use the closest level at or below theirs
+ZOOM_LEVELS: Final = (4, 8, 11, 13, 15, 17)
+BUCKET_PIXELS: Final = 4
+TILE_SIZE: Final = 256
+MAX_LATITUDE: Final = 85.05112878
+
+# tracks start over on a restart, keeps the ETags of different runs apart
+TRACK_EPOCH: Final = int(time())
+
+TRACK_URL: Final = f"/api/{DOMAIN}/track/{{entry_id}}/{{unitnumber}}"
+
+
+def pixel_bucket(latitude: float, longitude: float, zoom: int) -> tuple[int, int]:
+    """Return the bucket of a position on the web mercator tiles of a zoom level."""
+    scale = TILE_SIZE * 2**zoom / BUCKET_PIXELS
+    latitude = radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, latitude)))
+    x = (longitude + 180) / 360 * scale
+    y = (1 - log(tan(latitude) + 1 / cos(latitude)) / pi) / 2 * scale
+    return int(x), int(y)
+
+
+class UnitTrack:
+    """The last fixes of a unit and their simplified tracks per zoom level."""
+
+    __slots__ = ("version", "_sequence", "_fixes", "_levels", "_buckets", "_cache")
+
+    def __init__(self, length: int = TRACK_LENGTH) -> None:
+        """Start without any fixes."""
+        # changes with every fix, part of the ETag
+        self.version = 0
+        self._sequence = 0
+        self._fixes: deque[tuple[int, float, float, str]] = deque(maxlen=length)
+        self._levels: dict[int, deque[tuple[int, float, float, str]]] = {zoom: deque() for zoom in ZOOM_LEVELS}
+        self._buckets: dict[int, tuple[int, int] | None] = dict.fromkeys(ZOOM_LEVELS)
+        self._cache: dict[int, bytes] = {}
+
+    def add(self, unit_state: TrackingUnitState, fix_time: datetime) -> bool:
+        """Add the fix of a transmission, return False for repeated fixes and transmissions without a position."""
+        try:
+            latitude = float(unit_state["latitude"])
+            longitude = float(unit_state["longitude"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        fix_time_iso = fix_time.isoformat()
+        if self._fixes and self._fixes[-1][3] == fix_time_iso:
+            return False
+
+        self._sequence += 1
+        fix = (self._sequence, longitude, latitude, fix_time_iso)
+        self._fixes.append(fix)
+        oldest = self._fixes[0]
+        for zoom, level in self._levels.items():
+            if level and level[0][0] < oldest[0]:
+                while level and level[0][0] < oldest[0]:
+                    level.popleft()
+                # the track keeps starting at the oldest fix
+                if not level:
+                    self._buckets[zoom] = pixel_bucket(oldest[2], oldest[1], zoom)
+                if not level or level[0] is not oldest:
+                    level.appendleft(oldest)
+            bucket = pixel_bucket(latitude, longitude, zoom)
+            if bucket != self._buckets[zoom]:
+                self._buckets[zoom] = bucket
+                level.append(fix)
+
+        self.version += 1
+        self._cache.clear()
+        return True
+
+    @staticmethod
+    def level_for(zoom: int) -> int:
+        """Return the closest zoom level with a simplified track at or below a requested one."""
+        return max((level for level in ZOOM_LEVELS if level <= zoom), default=ZOOM_LEVELS[0])
+
+    def geojson(self, level: int, properties: dict[str, Any]) -> bytes:
+        """Return the simplified track of a zoom level as a serialized GeoJSON feature."""
+        if (cached := self._cache.get(level)) is None:
+            fixes = list(self._levels[level])
+            # the last fix is always included so the track ends where the unit is
+            if self._fixes and (not fixes or fixes[-1] is not self._fixes[-1]):
+                fixes.append(self._fixes[-1])
+            feature = {
+                "type": "Feature",
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": [[longitude, latitude] for _, longitude, latitude, _ in fixes],
+                },
+                "properties": {
+                    **properties,
+                    "zoom": level,
+                    "times": [fix_time for _, _, _, fix_time in fixes],
+                },
+            }
+            cached = self._cache[level] = json.dumps(feature, separators=(",", ":")).encode()
+        return cached
+
+
+class ZeroTrackView(HomeAssistantView):
+    """Serve the recent track of a unit, ?zoom= picks the simplification."""
+
+    url = TRACK_URL
+    name = f"api:{DOMAIN}:track"
+    requires_auth = True
+
+    async def get(self, request: web.Request, entry_id: str, unitnumber: str) -> web.Response:
+        """Return the track, or 304 when the ETag of the client is still current."""
+        hass: HomeAssistant = request.app["hass"]
+        coordinator: ZeroCoordinator | None = hass.data.get(DOMAIN, {}).get(entry_id)
+        scan_state = coordinator.units_scan_state.get(unitnumber) if coordinator else None
+        if scan_state is None:
+            return self.json_message("Unknown unit", HTTPStatus.NOT_FOUND)
+
+        try:
+            zoom = int(request.query.get("zoom", ZOOM_LEVELS[-1]))
+        except ValueError:
+            return self.json_message("zoom has to be a number", HTTPStatus.BAD_REQUEST)
+
+        track = scan_state.track
+        level = track.level_for(zoom)
+        etag = f'"{unitnumber}-{TRACK_EPOCH}-{track.version}-{level}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        return web.Response(
+            body=track.geojson(level, {"unitnumber": unitnumber}),
+            content_type="application/geo+json",
+            headers=headers,
+        )
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Measure the memory the entities of a fleet take per bike with tracemalloc.
+
+Sets up the sensor, binary_sensor, switch and device_tracker platforms for fleets
+of made up units, the way Home Assistant would, and reports the memory allocated
+per bike, including its share of the coordinator. Nothing is sent to the api,
+the units and their data are generated.
+
+    python3 scripts/benchmark_memory.py 100 250 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+from pathlib import Path
+import sys
+import tempfile
+import tracemalloc
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+# imported before measuring, the entity descriptions are shared by every bike
+from zero_motorcycles_integration2 import binary_sensor, device_tracker, sensor, switch  # noqa: E402
+from zero_motorcycles_integration2.const import DOMAIN  # noqa: E402
+from zero_motorcycles_integration2.coordinator import ZeroCoordinator  # noqa: E402
+
+PLATFORMS = (sensor, binary_sensor, switch, device_tracker)
+
+
+def make_unit(index: int) -> dict:
+    """Return a unit like the api lists them."""
+    return {
+        "unitnumber": str(1000000 + index),
+        "name": f"538SD2Z{index:010d}",
+        "vehiclemodel": "SR/F",
+        "vehiclecolor": "black",
+        "unittype": 5,
+        "active": 1,
+    }
+
+
+def make_unit_state(unit: dict, index: int) -> dict:
+    """Return the data of a parked bike like the api sends it."""
+    return {
+        "unitnumber": unit["unitnumber"],
+        "name": unit["name"],
+        "mileage": 1234.5 + index,
+        "software_version": "190430",
+        "longitude": 4.89 + index / 1e4,
+        "latitude": 52.37 + index / 1e4,
+        "altitude": 3,
+        "gps_valid": 1,
+        "gps_connected": 1,
+        "satellites": 9,
+        "velocity": 0,
+        "heading": 180,
+        "ignition": 0,
+        "main_voltage": 12.6,
+        "datetime_utc": "20261019120000",
+        "datetime_actual": "20261019120000",
+        "address": "Damrak 1, Amsterdam",
+        "soc": 80,
+        "tipover": 0,
+        "charging": 0,
+        "chargecomplete": 0,
+        "pluggedin": 0,
+        "chargingtimeleft": 0,
+        "storage": 0,
+        "battery": 100,
+    }
+
+
+async def async_measure(hass: HomeAssistant, fleet_size: int) -> tuple[int, int]:
+    """Set up the platforms for a fleet, return the bytes allocated and the number of entities."""
+
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=f"benchmark {fleet_size}",
+        data={CONF_USERNAME: f"benchmark{fleet_size}", CONF_PASSWORD: ""},
+        source="user",
+        options={},
+        unique_id=None,
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
+    entities: list = []
+
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+
+    coordinator = ZeroCoordinator(hass, entry)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    units = [make_unit(index) for index in range(fleet_size)]
+    coordinator.set_units(units, coordinator.clock.now())
+    coordinator.data = MappingProxyType({
+        unit["unitnumber"]: make_unit_state(unit, index) for index, unit in enumerate(units)
+    })
+    for platform in PLATFORMS:
+        await platform.async_setup_entry(hass, entry, entities.extend)
+    # attributes are built once the entities are written
+    for entity in entities:
+        entity.extra_state_attributes  # noqa: B018
+
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+
+    del hass.data[DOMAIN][entry.entry_id]
+    return allocated, len(entities)
+
+
+async def async_main(fleet_sizes: list[int]) -> None:
+    """Measure every fleet size with its own config entry and coordinator."""
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        tracemalloc.start()
+        sys.stdout.write(f"{'bikes':>6} {'entities':>9} {'total KiB':>10} {'per bike KiB':>13}\n")
+        for fleet_size in fleet_sizes:
+            allocated, entity_count = await async_measure(hass, fleet_size)
+            sys.stdout.write(
+                f"{fleet_size:>6} {entity_count:>9} {allocated / 1024:>10.1f} {allocated / fleet_size / 1024:>13.2f}\n"
+            )
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fleet_sizes", nargs="*", type=int, default=[100, 250, 500])
+    asyncio.run(async_main(parser.parse_args().fleet_sizes))